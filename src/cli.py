@@ -5,11 +5,30 @@ Este módulo proporciona una interfaz CLI interactiva para gestionar tareas,
 permitiendo crear, actualizar, eliminar, listar y filtrar tareas.
 """
 
+import argparse
 import sys
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from .task_manager import TaskManager
-from .utils import format_date, parse_date, validate_status, display_tasks_table
+from .utils import (format_date, parse_date, validate_status, display_tasks_table,
+                    YES_RESPONSES)
+
+
+# Menú principal completo, impreso con una sola escritura en cada iteración
+_MAIN_MENU = "\n".join([
+    "\n📋 MENÚ PRINCIPAL",
+    "-" * 30,
+    "1. ➕ Crear nueva tarea",
+    "2. 📋 Listar todas las tareas",
+    "3. 🔍 Buscar tareas",
+    "4. ✏️  Actualizar tarea",
+    "5. ❌ Eliminar tarea",
+    "6. 📊 Ver estadísticas",
+    "7. 🔽 Filtrar tareas",
+    "8. ⚠️  Ver tareas vencidas",
+    "9. 💾 Exportar/Importar",
+    "0. 🚪 Salir",
+])
 
 
 class TaskCLI:
@@ -19,10 +38,33 @@ class TaskCLI:
     Proporciona un menú interactivo para gestionar tareas.
     """
     
-    def __init__(self):
-        """Inicializa la interfaz CLI."""
-        self.task_manager = TaskManager()
+    def __init__(self, assume_yes: bool = False,
+                 task_manager: Optional[TaskManager] = None):
+        """
+        Inicializa la interfaz CLI.
+        
+        Args:
+            assume_yes (bool): Si es True, no pide confirmación al eliminar o importar
+            task_manager (TaskManager): Gestor a usar; por defecto se crea uno
+                sobre tasks.json
+        """
+        self.task_manager = task_manager if task_manager is not None else TaskManager()
         self.running = True
+        self.assume_yes = assume_yes
+    
+    def confirm(self, prompt: str) -> bool:
+        """
+        Pide confirmación al usuario, salvo que se haya indicado --yes.
+        
+        Args:
+            prompt (str): Pregunta a mostrar
+            
+        Returns:
+            bool: True si la acción está confirmada
+        """
+        if self.assume_yes:
+            return True
+        return input(prompt).strip().lower() in YES_RESPONSES
     
     def run(self):
         """
@@ -40,18 +82,7 @@ class TaskCLI:
         """
         Muestra el menú principal de opciones.
         """
-        print("\n📋 MENÚ PRINCIPAL")
-        print("-" * 30)
-        print("1. ➕ Crear nueva tarea")
-        print("2. 📋 Listar todas las tareas")
-        print("3. 🔍 Buscar tareas")
-        print("4. ✏️  Actualizar tarea")
-        print("5. ❌ Eliminar tarea")
-        print("6. 📊 Ver estadísticas")
-        print("7. 🔽 Filtrar tareas")
-        print("8. ⚠️  Ver tareas vencidas")
-        print("9. 💾 Exportar/Importar")
-        print("0. 🚪 Salir")
+        print(_MAIN_MENU)
     
     def handle_choice(self, choice: str):
         """
@@ -235,9 +266,8 @@ class TaskCLI:
             return
         
         print(f"\nTarea a eliminar: {task}")
-        confirm = input("¿Está seguro? (s/N): ").strip().lower()
         
-        if confirm == 's':
+        if self.confirm("¿Está seguro? (s/N): "):
             if self.task_manager.delete_task(task_id):
                 print("✅ Tarea eliminada exitosamente.")
             else:
@@ -249,20 +279,23 @@ class TaskCLI:
         """
         Muestra estadísticas de las tareas.
         """
-        print("\n📊 ESTADÍSTICAS")
-        print("-" * 15)
-        
         stats = self.task_manager.get_task_statistics()
         
-        print(f"📋 Total de tareas: {stats['total']}")
-        print(f"⏳ Pendientes: {stats['pendiente']}")
-        print(f"🔄 En progreso: {stats['en_progreso']}")
-        print(f"✅ Completadas: {stats['completada']}")
-        print(f"⚠️  Vencidas: {stats['vencidas']}")
+        lines = [
+            "\n📊 ESTADÍSTICAS",
+            "-" * 15,
+            f"📋 Total de tareas: {stats['total']}",
+            f"⏳ Pendientes: {stats['pendiente']}",
+            f"🔄 En progreso: {stats['en_progreso']}",
+            f"✅ Completadas: {stats['completada']}",
+            f"⚠️  Vencidas: {stats['vencidas']}",
+        ]
         
         if stats['total'] > 0:
             completion_rate = (stats['completada'] / stats['total']) * 100
-            print(f"📈 Tasa de finalización: {completion_rate:.1f}%")
+            lines.append(f"📈 Tasa de finalización: {completion_rate:.1f}%")
+        
+        print("\n".join(lines))
     
     def filter_tasks(self):
         """
@@ -347,7 +380,7 @@ class TaskCLI:
         filename = input("Nombre del archivo (tasks_backup.json): ").strip()
         filename = filename if filename else "tasks_backup.json"
         
-        if self.task_manager.save_to_file(filename):
+        if self.task_manager.save_to_file(filename, pretty=True):
             print(f"✅ Tareas exportadas exitosamente a '{filename}'.")
         else:
             print("❌ Error al exportar las tareas.")
@@ -362,9 +395,8 @@ class TaskCLI:
             return
         
         print("⚠️  ADVERTENCIA: Esto reemplazará todas las tareas actuales.")
-        confirm = input("¿Continuar? (s/N): ").strip().lower()
         
-        if confirm == 's':
+        if self.confirm("¿Continuar? (s/N): "):
             if self.task_manager.load_from_file(filename):
                 print(f"✅ Tareas importadas exitosamente desde '{filename}'.")
             else:
@@ -381,12 +413,25 @@ class TaskCLI:
         self.running = False
 
 
-def main():
+def main(argv: Optional[List[str]] = None,
+         task_manager: Optional[TaskManager] = None):
     """
     Función principal para ejecutar la CLI.
+    
+    Args:
+        argv (List[str]): Argumentos de línea de comandos (por defecto sys.argv)
+        task_manager (TaskManager): Gestor a usar (opcional)
     """
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Tareas")
+    parser.add_argument(
+        "-y", "--yes",
+        action="store_true",
+        help="no pedir confirmación al eliminar o importar tareas"
+    )
+    args = parser.parse_args(argv)
+    
     try:
-        cli = TaskCLI()
+        cli = TaskCLI(assume_yes=args.yes, task_manager=task_manager)
         cli.run()
     except KeyboardInterrupt:
         print("\n\n👋 Programa interrumpido por el usuario. ¡Hasta luego!")
@@ -0,0 +1,235 @@
+"""
+Módulo de almacenamiento para el Sistema de Gestión de Tareas.
+
+Define dónde guarda el TaskManager sus datos ya serializados: en un archivo
+(FileStorage) o en memoria (MemoryStorage). Cada almacenamiento guarda una
+copia completa de los datos y un diario de cambios que se añade al final.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+# Sufijo del diario de cambios que acompaña al archivo de datos
+JOURNAL_SUFFIX = ".log"
+
+
+class Storage(ABC):
+    """
+    Interfaz común de los almacenamientos de tareas.
+    
+    Las subclases deben implementar todos los métodos abstractos.
+    
+    Attributes:
+        name (str): Nombre del almacenamiento; su sufijo decide el formato
+    """
+    
+    name: str
+    
+    @abstractmethod
+    def read(self) -> Optional[bytes]:
+        """
+        Lee la copia completa de los datos.
+        
+        Returns:
+            Optional[bytes]: Datos guardados, o None si aún no existen
+        """
+    
+    @abstractmethod
+    def write(self, payload: bytes) -> None:
+        """
+        Reemplaza la copia completa de los datos.
+        
+        Args:
+            payload (bytes): Datos serializados
+        """
+    
+    @abstractmethod
+    def append(self, line: bytes) -> None:
+        """
+        Añade una línea al final del diario de cambios.
+        
+        Args:
+            line (bytes): Registro serializado, terminado en salto de línea
+        """
+    
+    @abstractmethod
+    def read_journal(self) -> bytes:
+        """
+        Lee el diario de cambios.
+        
+        Returns:
+            bytes: Contenido del diario, vacío si no existe
+        """
+    
+    @abstractmethod
+    def clear_journal(self) -> None:
+        """
+        Descarta el diario de cambios.
+        """
+
+
+class FileStorage(Storage):
+    """
+    Almacenamiento en un archivo, con el diario en ``path + ".log"``.
+    
+    Attributes:
+        name (str): Ruta del archivo de datos
+        journal_path (str): Ruta del diario de cambios
+    """
+    
+    def __init__(self, path: str):
+        """
+        Inicializa el almacenamiento en archivo.
+        
+        Args:
+            path (str): Ruta del archivo de datos
+        """
+        self.name = path
+        self.journal_path = path + JOURNAL_SUFFIX
+    
+    def read(self) -> Optional[bytes]:
+        """
+        Lee el archivo de datos completo.
+        
+        Returns:
+            Optional[bytes]: Contenido del archivo, o None si no existe
+        """
+        if not os.path.exists(self.name):
+            return None
+        with open(self.name, 'rb') as f:
+            return f.read()
+    
+    def write(self, payload: bytes) -> None:
+        """
+        Reemplaza el archivo de datos de forma atómica.
+        
+        Se escribe en un temporal y se renombra sobre el destino: un fallo a
+        mitad de la escritura nunca deja el archivo a medias.
+        
+        Args:
+            payload (bytes): Datos serializados
+        """
+        tmp_path = self.name + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.name)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def append(self, line: bytes) -> None:
+        """
+        Añade una línea al final del diario.
+        
+        Args:
+            line (bytes): Registro serializado
+        """
+        with open(self.journal_path, 'ab') as f:
+            f.write(line)
+    
+    def read_journal(self) -> bytes:
+        """
+        Lee el diario de cambios.
+        
+        Returns:
+            bytes: Contenido del diario, vacío si no existe
+        """
+        if not os.path.exists(self.journal_path):
+            return b""
+        with open(self.journal_path, 'rb') as f:
+            return f.read()
+    
+    def clear_journal(self) -> None:
+        """
+        Elimina el diario de cambios, si existe.
+        """
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+    
+    def __repr__(self) -> str:
+        """
+        Representación técnica del almacenamiento.
+        
+        Returns:
+            str: Representación técnica del objeto
+        """
+        return f"FileStorage(path='{self.name}')"
+
+
+class MemoryStorage(Storage):
+    """
+    Almacenamiento en memoria, sin acceso a disco; útil en pruebas.
+    
+    Attributes:
+        name (str): Nombre del almacenamiento; su sufijo decide el formato
+        data (Optional[bytes]): Última copia completa guardada
+        journal (bytearray): Diario de cambios
+    """
+    
+    def __init__(self, name: str = "memoria.json"):
+        """
+        Inicializa un almacenamiento vacío.
+        
+        Args:
+            name (str): Nombre del almacenamiento
+        """
+        self.name = name
+        self.data: Optional[bytes] = None
+        self.journal = bytearray()
+    
+    def read(self) -> Optional[bytes]:
+        """
+        Devuelve la copia completa guardada.
+        
+        Returns:
+            Optional[bytes]: Datos guardados, o None si aún no hay
+        """
+        return self.data
+    
+    def write(self, payload: bytes) -> None:
+        """
+        Reemplaza la copia completa guardada.
+        
+        Args:
+            payload (bytes): Datos serializados
+        """
+        self.data = bytes(payload)
+    
+    def append(self, line: bytes) -> None:
+        """
+        Añade una línea al final del diario.
+        
+        Args:
+            line (bytes): Registro serializado
+        """
+        self.journal += line
+    
+    def read_journal(self) -> bytes:
+        """
+        Devuelve el diario de cambios.
+        
+        Returns:
+            bytes: Contenido del diario
+        """
+        return bytes(self.journal)
+    
+    def clear_journal(self) -> None:
+        """
+        Vacía el diario de cambios.
+        """
+        self.journal.clear()
+    
+    def __repr__(self) -> str:
+        """
+        Representación técnica del almacenamiento.
+        
+        Returns:
+            str: Representación técnica del objeto
+        """
+        return f"MemoryStorage(name='{self.name}')"
@@ -5,8 +5,33 @@ Esta clase representa una tarea individual con sus atributos y métodos
 para manipular la información de la tarea.
 """
 
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timedelta
+from typing import Dict, Any, Union
+
+try:
+    # Parser ISO-8601 en C, opcional; más rápido en cargas grandes
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+# Origen de las fechas guardadas como microsegundos enteros (sin zona horaria)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _parse_date_value(value: Union[str, int]) -> datetime:
+    """
+    Convierte una fecha serializada en datetime.
+    
+    Args:
+        value (Union[str, int]): Fecha ISO-8601 o microsegundos desde 1970-01-01
+        
+    Returns:
+        datetime: Fecha convertida
+    """
+    if isinstance(value, int):
+        return _EPOCH + timedelta(microseconds=value)
+    return _parse_iso(value)
 
 
 class Task:
@@ -20,9 +45,21 @@ class Task:
         due_date (datetime): Fecha de vencimiento
         status (str): Estado actual (pendiente, en_progreso, completada)
         created_at (datetime): Fecha de creación
+    
+    Si la tarea pertenece a un TaskManager, los cambios en name,
+    description, due_date o status (con update() o asignando el atributo)
+    se notifican al gestor, que actualiza sus índices y los guarda.
     """
     
+    __slots__ = ("id", "_due_date", "_status",
+                 "_name", "_name_lower", "_description", "_description_lower",
+                 "_created_at", "_created_at_iso", "_dict_cache", "_owner")
+    
     VALID_STATUSES = ["pendiente", "en_progreso", "completada"]
+    # Estado -> su cadena canónica: valida en O(1) y hace que todas las tareas
+    # compartan el mismo objeto por estado, así las comparaciones terminan
+    # en la comprobación de identidad
+    _CANONICAL_STATUSES = {status: status for status in VALID_STATUSES}
     
     def __init__(self, id: int, name: str, description: str = "", 
                  due_date: datetime = None, status: str = "pendiente"):
@@ -39,21 +76,211 @@ class Task:
         Raises:
             ValueError: Si el estado no es válido
         """
-        if status not in self.VALID_STATUSES:
-            raise ValueError(f"Estado inválido. Estados válidos: {self.VALID_STATUSES}")
+        canonical_status = self._canonical_status(status)
         
+        # Una sola lectura del reloj para la creación y el vencimiento por defecto
+        now = datetime.now()
+        # Escritura directa de los slots: una tarea nueva no tiene gestor ni
+        # diccionario en caché que invalidar
         self.id = id
-        self.name = name
-        self.description = description
-        self.due_date = due_date or datetime.now()
-        self.status = status
-        self.created_at = datetime.now()
+        self._name = name
+        self._name_lower = name.lower()
+        self._description = description
+        self._description_lower = description.lower()
+        self._due_date = due_date or now
+        self._status = canonical_status
+        self._created_at = now
+        self._created_at_iso = None
+        self._dict_cache = None
+        # Sin gestor hasta que un TaskManager la adopte
+        self._owner = None
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Estado para copy y pickle, sin el gestor propietario ni la caché.
+        
+        Una copia no pertenece a ningún gestor: copiar una tarea no debe
+        copiar (ni modificar) el TaskManager que la contiene.
+        
+        Returns:
+            Dict[str, Any]: Slots de la tarea
+        """
+        return {slot: getattr(self, slot) for slot in self.__slots__
+                if slot not in ("_owner", "_dict_cache")}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restaura una tarea copiada o deserializada, sin gestor propietario.
+        
+        Args:
+            state (Dict[str, Any]): Slots devueltos por __getstate__
+        """
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._dict_cache = None
+        self._owner = None
+    
+    @classmethod
+    def _canonical_status(cls, status: str) -> str:
+        """
+        Valida un estado y devuelve su cadena canónica.
+        
+        Args:
+            status (str): Estado a validar
+            
+        Returns:
+            str: Cadena canónica del estado
+            
+        Raises:
+            ValueError: Si el estado no es válido
+        """
+        canonical_status = cls._CANONICAL_STATUSES.get(status)
+        if canonical_status is None:
+            raise ValueError(f"Estado inválido. Estados válidos: {cls.VALID_STATUSES}")
+        return canonical_status
+    
+    def _assign(self, values: Dict[str, Any]) -> None:
+        """
+        Escribe atributos que forman parte de to_dict().
+        
+        Invalida el diccionario serializado en caché y, si la tarea pertenece
+        a un gestor, le notifica el cambio.
+        
+        Args:
+            values (Dict[str, Any]): Nombre del slot -> nuevo valor
+        """
+        owner = getattr(self, "_owner", None)
+        if owner is None:
+            for slot, value in values.items():
+                setattr(self, slot, value)
+            self._dict_cache = None
+            return
+        with owner._task_changing(self):
+            for slot, value in values.items():
+                setattr(self, slot, value)
+            self._dict_cache = None
+    
+    @property
+    def name(self) -> str:
+        """
+        Nombre de la tarea.
+        
+        Returns:
+            str: Nombre de la tarea
+        """
+        return self._name
+    
+    @name.setter
+    def name(self, value: str) -> None:
+        """
+        Establece el nombre y guarda su versión en minúsculas para búsquedas.
+        
+        Args:
+            value (str): Nuevo nombre
+        """
+        self._assign({"_name": value, "_name_lower": value.lower()})
+    
+    @property
+    def description(self) -> str:
+        """
+        Descripción de la tarea.
+        
+        Returns:
+            str: Descripción de la tarea
+        """
+        return self._description
+    
+    @description.setter
+    def description(self, value: str) -> None:
+        """
+        Establece la descripción y guarda su versión en minúsculas para búsquedas.
+        
+        Args:
+            value (str): Nueva descripción
+        """
+        self._assign({"_description": value, "_description_lower": value.lower()})
+    
+    @property
+    def due_date(self) -> datetime:
+        """
+        Fecha de vencimiento de la tarea.
+        
+        Returns:
+            datetime: Fecha de vencimiento
+        """
+        return self._due_date
+    
+    @due_date.setter
+    def due_date(self, value: datetime) -> None:
+        """
+        Establece la fecha de vencimiento.
+        
+        Args:
+            value (datetime): Nueva fecha de vencimiento
+            
+        Raises:
+            ValueError: Si la fecha es None
+        """
+        if value is None:
+            raise ValueError("La fecha de vencimiento no puede ser None")
+        self._assign({"_due_date": value})
+    
+    @property
+    def status(self) -> str:
+        """
+        Estado actual de la tarea.
+        
+        Returns:
+            str: Estado de la tarea
+        """
+        return self._status
+    
+    @status.setter
+    def status(self, value: str) -> None:
+        """
+        Valida el estado y guarda su cadena canónica.
+        
+        Args:
+            value (str): Nuevo estado
+            
+        Raises:
+            ValueError: Si el estado no es válido
+        """
+        self._assign({"_status": self._canonical_status(value)})
+    
+    @property
+    def created_at(self) -> datetime:
+        """
+        Fecha de creación de la tarea.
+        
+        Las tareas cargadas guardan solo la forma ISO y la convierten en el
+        primer acceso.
+        
+        Returns:
+            datetime: Fecha de creación
+        """
+        if self._created_at is None:
+            self._created_at = _parse_date_value(self._created_at_iso)
+        return self._created_at
+    
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        """
+        Establece la fecha de creación; su forma ISO se genera al serializar.
+        
+        Args:
+            value (datetime): Nueva fecha de creación
+        """
+        self._assign({"_created_at": value, "_created_at_iso": None})
     
     def update(self, name: str = None, description: str = None, 
                due_date: datetime = None, status: str = None) -> None:
         """
         Actualiza los atributos de la tarea.
         
+        Si pertenece a un gestor, este recibe un único aviso con todos los
+        cambios.
+        
         Args:
             name (str): Nuevo nombre de la tarea
             description (str): Nueva descripción
@@ -63,6 +290,32 @@ class Task:
         Raises:
             ValueError: Si el estado no es válido
         """
+        # Validar antes de modificar nada, para no dejar cambios a medias
+        canonical_status = None if status is None else self._canonical_status(status)
+        
+        owner = getattr(self, "_owner", None)
+        if owner is None:
+            self._set_fields(name, description, due_date, canonical_status)
+            return
+        # Desvincular durante el bloque para que el gestor reciba un solo aviso
+        self._owner = None
+        try:
+            with owner._task_changing(self):
+                self._set_fields(name, description, due_date, canonical_status)
+        finally:
+            self._owner = owner
+    
+    def _set_fields(self, name: str, description: str, due_date: datetime,
+                    status: str) -> None:
+        """
+        Asigna los atributos indicados; los None se dejan sin cambios.
+        
+        Args:
+            name (str): Nuevo nombre de la tarea
+            description (str): Nueva descripción
+            due_date (datetime): Nueva fecha de vencimiento
+            status (str): Nuevo estado, ya validado
+        """
         if name is not None:
             self.name = name
         if description is not None:
@@ -70,8 +323,6 @@ class Task:
         if due_date is not None:
             self.due_date = due_date
         if status is not None:
-            if status not in self.VALID_STATUSES:
-                raise ValueError(f"Estado inválido. Estados válidos: {self.VALID_STATUSES}")
             self.status = status
     
     def to_dict(self) -> Dict[str, Any]:
@@ -81,20 +332,53 @@ class Task:
         Returns:
             Dict[str, Any]: Diccionario con los datos de la tarea
         """
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "due_date": self.due_date.isoformat(),
-            "status": self.status,
-            "created_at": self.created_at.isoformat()
-        }
+        return dict(self._as_dict())
+    
+    def _as_dict(self) -> Dict[str, Any]:
+        """
+        Devuelve el diccionario serializado compartido, construyéndolo si hace falta.
+        
+        Se reutiliza hasta que cambie algún atributo; no debe modificarse.
+        
+        Returns:
+            Dict[str, Any]: Diccionario con los datos de la tarea
+        """
+        data = self._dict_cache
+        if data is None:
+            if self._created_at_iso is None:
+                self._created_at_iso = self._created_at.isoformat()
+            data = {
+                "id": self.id,
+                "name": self._name,
+                "description": self._description,
+                "due_date": self._due_date.isoformat(),
+                "status": self._status,
+                "created_at": self._created_at_iso
+            }
+            self._dict_cache = data
+        return data
+    
+    def _as_binary_dict(self) -> Dict[str, Any]:
+        """
+        Diccionario para formatos binarios, con la fecha de vencimiento en
+        microsegundos enteros para no tener que interpretar texto al cargar.
+        
+        Returns:
+            Dict[str, Any]: Diccionario con los datos de la tarea
+        """
+        data = self._as_dict()
+        if self.due_date.tzinfo is not None:
+            return data  # Las fechas con zona horaria se mantienen en ISO
+        return {**data, "due_date": (self.due_date - _EPOCH) // _MICROSECOND}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Task':
         """
         Crea una tarea desde un diccionario.
         
+        Las fechas pueden venir en ISO-8601 o como microsegundos enteros
+        desde 1970-01-01.
+        
         Args:
             data (Dict[str, Any]): Diccionario con los datos de la tarea
             
@@ -105,10 +389,12 @@ class Task:
             id=data["id"],
             name=data["name"],
             description=data.get("description", ""),
-            due_date=datetime.fromisoformat(data["due_date"]),
+            due_date=_parse_date_value(data["due_date"]),
             status=data["status"]
         )
-        task.created_at = datetime.fromisoformat(data["created_at"])
+        # La fecha de creación se convierte solo si se consulta
+        task._created_at = None
+        task._created_at_iso = data["created_at"]
         return task
     
     def __str__(self) -> str:
@@ -6,10 +6,107 @@ incluyendo creación, actualización, eliminación, filtrado y persistencia.
 """
 
 import json
-import os
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from .task import Task
+from .storage import Storage, FileStorage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Los archivos con este sufijo se guardan en MessagePack en lugar de JSON
+MSGPACK_SUFFIX = ".msgpack"
+
+
+def _dumps(data: Dict[str, Any], filename: str, pretty: bool = False) -> bytes:
+    """
+    Serializa los datos en el formato que corresponde al archivo.
+    
+    Args:
+        data (Dict[str, Any]): Datos a serializar
+        filename (str): Archivo de destino; su sufijo decide el formato
+        pretty (bool): Si es True, indenta el JSON para lectura humana
+        
+    Returns:
+        bytes: Contenido del archivo
+        
+    Raises:
+        ImportError: Si el archivo es MessagePack y msgpack no está instalado
+    """
+    if filename.endswith(MSGPACK_SUFFIX):
+        if msgpack is None:
+            raise ImportError("msgpack no está instalado")
+        return msgpack.packb(data)
+    if orjson is not None:
+        # orjson genera UTF-8 directamente, sin escapar caracteres no ASCII
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    # Sin indent se usa el codificador en C
+    if pretty:
+        content = json.dumps(data, indent=2, ensure_ascii=False)
+    else:
+        content = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+    return content.encode('utf-8')
+
+
+def _loads(raw: bytes, filename: str) -> Dict[str, Any]:
+    """
+    Deserializa el contenido de un archivo según su formato.
+    
+    Args:
+        raw (bytes): Contenido del archivo
+        filename (str): Archivo de origen; su sufijo decide el formato
+        
+    Returns:
+        Dict[str, Any]: Datos deserializados
+        
+    Raises:
+        ImportError: Si el archivo es MessagePack y msgpack no está instalado
+    """
+    if filename.endswith(MSGPACK_SUFFIX):
+        if msgpack is None:
+            raise ImportError("msgpack no está instalado")
+        return msgpack.unpackb(raw)
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    """
+    Serializa un registro del diario como una línea JSON.
+    
+    Args:
+        record (Dict[str, Any]): Registro a serializar
+        
+    Returns:
+        bytes: Línea JSON en UTF-8 terminada en salto de línea
+    """
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _trigrams(text: str) -> Set[str]:
+    """
+    Obtiene los trigramas (subcadenas de 3 caracteres) de un texto.
+    
+    Args:
+        text (str): Texto en minúsculas
+        
+    Returns:
+        Set[str]: Conjunto de trigramas del texto
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
 
 
 class TaskManager:
@@ -17,24 +114,323 @@ class TaskManager:
     Gestiona todas las operaciones relacionadas con las tareas.
     
     Attributes:
-        tasks (list): Lista de todas las tareas
+        tasks (list): Lista de todas las tareas (copia, en orden de inserción)
         next_id (int): Próximo ID disponible
         data_file (str): Archivo donde se guardan las tareas
+        storage (Storage): Almacenamiento de los datos (archivo o memoria)
+        autosave (bool): Si es True, cada cambio se guarda inmediatamente
+        default_autosave (bool): Valor de autosave para los gestores creados
+            sin indicarlo (atributo de clase)
+    
+    Con autosave, cada cambio se añade como una línea al diario
+    (``data_file + ".log"`` en disco) en lugar de reescribir todo el archivo. Al cargar se
+    lee el archivo de datos y se reaplica el diario; cuando el diario supera
+    el doble del tamaño del archivo de datos, se compacta en uno nuevo.
+    
+    Las tareas devueltas son las del propio gestor: cambiarlas con
+    Task.update() o asignando sus atributos equivale a usar update_task().
+    Las tareas eliminadas dejan de estar vinculadas al gestor.
     """
     
-    def __init__(self, data_file: str = "tasks.json"):
+    default_autosave = True
+    
+    def __init__(self, data_file: str = "tasks.json", autosave: Optional[bool] = None,
+                 storage: Optional[Storage] = None):
         """
         Inicializa el gestor de tareas.
         
         Args:
             data_file (str): Nombre del archivo de datos
-        """
-        self.tasks: List[Task] = []
+            autosave (Optional[bool]): Guardar tras cada cambio; si es False, los
+                cambios se escriben al llamar a flush() o al salir del bloque
+                with. Por defecto, default_autosave
+            storage (Storage): Almacenamiento a usar en lugar de data_file,
+                p. ej. un MemoryStorage en pruebas (opcional)
+        """
+        # Tareas indexadas por ID; el dict conserva el orden de inserción
+        self._tasks: Dict[int, Task] = {}
         self.next_id = 1
-        self.data_file = data_file
+        self.storage = storage if storage is not None else FileStorage(data_file)
+        self.data_file = self.storage.name
+        self.autosave = self.default_autosave if autosave is None else autosave
+        # Hay cambios en memoria que aún no se han escrito en data_file
+        self._dirty = False
+        # data_file no tiene una copia válida sobre la que aplicar el diario
+        self._needs_snapshot = False
+        # Tamaños en bytes de data_file y de su diario, para decidir la compactación
+        self._snapshot_size = 0
+        self._journal_size = 0
+        # Índice invertido trigrama -> IDs de tareas para search_tasks
+        self._trigram_index: Dict[str, Set[int]] = defaultdict(set)
+        # Índice estado -> IDs de tareas con ese estado
+        self._by_status: Dict[str, Set[int]] = {
+            status: set() for status in Task.VALID_STATUSES
+        }
+        # Pares (due_date, ID) ordenados para localizar vencidas con bisect
+        self._due_index: List[Tuple[datetime, int]] = []
+        # Contador de cambios en los índices, para invalidar cachés derivadas
+        self._version = 0
+        # Estadísticas cacheadas: (versión, válidas hasta, estadísticas)
+        self._stats_cache: Optional[Tuple[int, Optional[datetime], Optional[datetime],
+                                          Dict[str, int]]] = None
+        # Resultados de búsqueda por consulta, válidos para _search_version
+        self._cached_search = lru_cache(maxsize=64)(self._search_uncached)
+        self._search_version = 0
         self.load_from_file()
     
+    @property
+    def tasks(self) -> List[Task]:
+        """
+        Lista de todas las tareas en orden de inserción.
+        
+        Returns:
+            List[Task]: Copia de la lista de tareas
+        """
+        return list(self._tasks.values())
+    
+    def __enter__(self) -> 'TaskManager':
+        """
+        Permite usar el gestor como context manager.
+        
+        Returns:
+            TaskManager: El propio gestor
+        """
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Guarda los cambios pendientes al salir del bloque with.
+        """
+        self.flush()
+    
+    def _record_change(self, record: Dict[str, Any]) -> None:
+        """
+        Registra un cambio ya aplicado en memoria.
+        
+        Con autosave y data_file al día, el cambio se añade al diario; en otro
+        caso se marca como pendiente y, con autosave, se guarda todo el archivo.
+        
+        Args:
+            record (Dict[str, Any]): Registro del cambio ("op" y sus datos)
+        """
+        if self.autosave and not self._dirty and not self._needs_snapshot:
+            if self._append_journal(record):
+                if self._journal_size > 2 * self._snapshot_size:
+                    self.compact()
+                return
+        self._dirty = True
+        if self.autosave:
+            self.flush()
+    
+    def _append_journal(self, record: Dict[str, Any]) -> bool:
+        """
+        Añade un registro al final del diario de cambios.
+        
+        Args:
+            record (Dict[str, Any]): Registro a añadir
+            
+        Returns:
+            bool: True si se escribió correctamente
+        """
+        line = _encode_record(record)
+        try:
+            self.storage.append(line)
+        except OSError as e:
+            print(f"Error al guardar archivo: {e}")
+            return False
+        self._journal_size += len(line)
+        return True
+    
+    def _replay_journal(self, journal: bytes, tasks: Dict[int, Task],
+                        next_id: int) -> Tuple[int, bool]:
+        """
+        Reaplica los cambios de un diario sobre las tareas cargadas.
+        
+        Una última línea incompleta (escritura interrumpida) se ignora, junto
+        con todo lo que la siga.
+        
+        Args:
+            journal (bytes): Contenido del diario
+            tasks (Dict[int, Task]): Tareas cargadas, indexadas por ID
+            next_id (int): Próximo ID según el archivo de datos
+            
+        Returns:
+            Tuple[int, bool]: Próximo ID tras aplicar el diario y si se pudo
+                leer el diario completo
+        """
+        for line in journal.splitlines():
+            try:
+                record = orjson.loads(line) if orjson is not None else json.loads(line)
+            except ValueError:
+                return next_id, False
+            op = record.get("op")
+            if op == "upsert":
+                task = Task.from_dict(record["task"])
+                tasks[task.id] = task
+                if task.id >= next_id:
+                    next_id = task.id + 1
+            elif op == "delete":
+                tasks.pop(record["id"], None)
+            elif op == "clear":
+                tasks.clear()
+                next_id = 1
+        return next_id, True
+    
+    def flush(self) -> bool:
+        """
+        Escribe en data_file los cambios pendientes, si los hay.
+        
+        Returns:
+            bool: True si no había cambios o se guardaron correctamente
+        """
+        if not self._dirty:
+            return True
+        if self.save_to_file():
+            self._dirty = False
+            return True
+        return False
+    
+    def compact(self) -> bool:
+        """
+        Integra el diario de cambios en una nueva copia completa de los datos.
+        
+        Returns:
+            bool: True si se guardó correctamente
+        """
+        return self.save_to_file()
+    
+    @contextmanager
+    def batch(self) -> Iterator["TaskManager"]:
+        """
+        Agrupa varios cambios y los guarda una sola vez al salir del bloque.
+        
+        Yields:
+            TaskManager: El propio gestor
+        """
+        previous = self.autosave
+        self.autosave = False
+        try:
+            yield self
+        finally:
+            self.autosave = previous
+            if previous:
+                self.flush()
+    
+    def _index_text(self, task: Task) -> None:
+        """
+        Añade el nombre y la descripción de una tarea al índice de trigramas.
+        
+        Args:
+            task (Task): Tarea a indexar
+        """
+        grams = _trigrams(task._name_lower) | _trigrams(task._description_lower)
+        for gram in grams:
+            self._trigram_index[gram].add(task.id)
+    
+    def _unindex_text(self, task: Task) -> None:
+        """
+        Retira el nombre y la descripción de una tarea del índice de trigramas.
+        
+        Args:
+            task (Task): Tarea a retirar
+        """
+        grams = _trigrams(task._name_lower) | _trigrams(task._description_lower)
+        for gram in grams:
+            postings = self._trigram_index.get(gram)
+            if postings is not None:
+                postings.discard(task.id)
+                if not postings:
+                    del self._trigram_index[gram]
+    
+    def _index_task(self, task: Task) -> None:
+        """
+        Añade una tarea a los índices de búsqueda, estado y vencimiento.
+        
+        Args:
+            task (Task): Tarea a indexar
+        """
+        self._by_status[task.status].add(task.id)
+        insort(self._due_index, (task.due_date, task.id))
+        self._index_text(task)
+        self._version += 1
+    
+    def _unindex_task(self, task: Task) -> None:
+        """
+        Elimina una tarea de los índices de búsqueda, estado y vencimiento.
+        
+        Args:
+            task (Task): Tarea a retirar de los índices
+        """
+        self._by_status[task.status].discard(task.id)
+        key = (task.due_date, task.id)
+        pos = bisect_left(self._due_index, key)
+        if pos < len(self._due_index) and self._due_index[pos] == key:
+            del self._due_index[pos]
+        self._unindex_text(task)
+        self._version += 1
+    
+    def _set_tasks(self, tasks: Dict[int, Task]) -> None:
+        """
+        Reemplaza todas las tareas del gestor y reconstruye los índices.
+        
+        Args:
+            tasks (Dict[int, Task]): Nuevas tareas, indexadas por ID
+        """
+        for task in self._tasks.values():
+            task._owner = None
+        for task in tasks.values():
+            task._owner = self
+        self._tasks = tasks
+        self._rebuild_indexes()
+    
+    @contextmanager
+    def _task_changing(self, task: Task) -> Iterator[None]:
+        """
+        Mantiene índices y diario al día mientras se modifica una tarea.
+        
+        Retira la tarea de los índices antes del bloque y, al terminar, la
+        vuelve a indexar y registra su nuevo estado.
+        
+        Args:
+            task (Task): Tarea del gestor que se va a modificar
+        """
+        self._unindex_task(task)
+        try:
+            yield
+        finally:
+            self._index_task(task)
+            self._record_change({"op": "upsert", "task": task._as_dict()})
+    
+    def _rebuild_indexes(self) -> None:
+        """
+        Reconstruye todos los índices a partir de las tareas.
+        """
+        self._trigram_index.clear()
+        for ids in self._by_status.values():
+            ids.clear()
+        # Ordenar una sola vez en lugar de insertar tarea a tarea
+        self._due_index = sorted((task.due_date, task.id) for task in self._tasks.values())
+        for task in self._tasks.values():
+            self._by_status[task.status].add(task.id)
+            self._index_text(task)
+        self._version += 1
+    
+    def _overdue_ids(self, now: datetime) -> List[int]:
+        """
+        Obtiene los IDs de las tareas no completadas que vencen antes de now.
+        
+        Args:
+            now (datetime): Momento de referencia
+            
+        Returns:
+            List[int]: IDs de tareas vencidas, ordenados por fecha de vencimiento
+        """
+        # (now,) es menor que cualquier (now, id): el corte deja solo due_date < now
+        cut = bisect_left(self._due_index, (now,))
+        completed = self._by_status["completada"]
+        return [task_id for _, task_id in self._due_index[:cut] if task_id not in completed]
     
+
     def create_task(self, name: str, description: str = "", 
                    due_date: datetime = None, status: str = "pendiente") -> Task:
         """
@@ -52,20 +448,24 @@ class TaskManager:
         Raises:
             ValueError: Si el nombre está vacío
         """
-        if not name.strip():
+        # Recortar una sola vez: sirve para validar y para guardar
+        name = name.strip()
+        if not name:
             raise ValueError("El nombre de la tarea no puede estar vacío")
         
         task = Task(
             id=self.next_id,
-            name=name.strip(),
+            name=name,
             description=description.strip(),
-            due_date=due_date or datetime.now(),
+            due_date=due_date,
             status=status
         )
         
-        self.tasks.append(task)
+        self._tasks[task.id] = task
+        self._index_task(task)
+        task._owner = self
         self.next_id += 1
-        self.save_to_file()
+        self._record_change({"op": "upsert", "task": task._as_dict()})
         
         return task
     
@@ -86,9 +486,9 @@ class TaskManager:
         """
         task = self.get_task_by_id(task_id)
         if task:
+            # La tarea avisa al gestor, que reindexa y registra el cambio
             task.update(name=name, description=description, 
                        due_date=due_date, status=status)
-            self.save_to_file()
             return True
         return False
     
@@ -102,10 +502,11 @@ class TaskManager:
         Returns:
             bool: True si se eliminó correctamente, False si no se encontró
         """
-        task = self.get_task_by_id(task_id)
+        task = self._tasks.pop(task_id, None)
         if task:
-            self.tasks.remove(task)
-            self.save_to_file()
+            task._owner = None
+            self._unindex_task(task)
+            self._record_change({"op": "delete", "id": task_id})
             return True
         return False
     
@@ -119,10 +520,7 @@ class TaskManager:
         Returns:
             Optional[Task]: La tarea si existe, None en caso contrario
         """
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._tasks.get(task_id)
     
     def list_tasks(self) -> List[Task]:
         """
@@ -131,7 +529,7 @@ class TaskManager:
         Returns:
             List[Task]: Lista de todas las tareas
         """
-        return self.tasks.copy()
+        return list(self._tasks.values())
     
     def filter_tasks(self, status: str = None, due_date_from: datetime = None,
                     due_date_to: datetime = None, name_contains: str = None) -> List[Task]:
@@ -147,24 +545,21 @@ class TaskManager:
         Returns:
             List[Task]: Lista de tareas filtradas
         """
-        filtered_tasks = self.tasks.copy()
-        
-        if status:
-            filtered_tasks = [task for task in filtered_tasks if task.status == status]
-        
-        if due_date_from:
-            filtered_tasks = [task for task in filtered_tasks 
-                            if task.due_date >= due_date_from]
+        if due_date_from or due_date_to:
+            # Acotar por rango con el índice de vencimientos (ambos extremos incluidos)
+            lo = bisect_left(self._due_index, (due_date_from,)) if due_date_from else 0
+            hi = (bisect_right(self._due_index, (due_date_to, float("inf")))
+                  if due_date_to else len(self._due_index))
+            ids = sorted(task_id for _, task_id in self._due_index[lo:hi])
+            candidates = [self._tasks[task_id] for task_id in ids]
+        else:
+            candidates = self._tasks.values()
         
-        if due_date_to:
-            filtered_tasks = [task for task in filtered_tasks 
-                            if task.due_date <= due_date_to]
-        
-        if name_contains:
-            filtered_tasks = [task for task in filtered_tasks 
-                            if name_contains.lower() in task.name.lower()]
-        
-        return filtered_tasks
+        # Un solo recorrido con el resto de criterios; los vacíos se ignoran
+        name_lower = name_contains.lower() if name_contains else None
+        return [task for task in candidates
+                if (not status or task.status == status)
+                and (not name_lower or name_lower in task._name_lower)]
     
     def get_tasks_by_status(self, status: str) -> List[Task]:
         """
@@ -176,7 +571,13 @@ class TaskManager:
         Returns:
             List[Task]: Lista de tareas con el estado especificado
         """
-        return self.filter_tasks(status=status)
+        if not status:
+            return self.list_tasks()
+        ids = self._by_status.get(status)
+        if not ids:
+            return []
+        # Los IDs crecen con cada creación, así que ordenarlos conserva el orden
+        return [self._tasks[task_id] for task_id in sorted(ids)]
     
     def get_overdue_tasks(self) -> List[Task]:
         """
@@ -185,49 +586,96 @@ class TaskManager:
         Returns:
             List[Task]: Lista de tareas vencidas
         """
-        now = datetime.now()
-        return [task for task in self.tasks 
-                if task.due_date < now and task.status != "completada"]
+        overdue_ids = self._overdue_ids(datetime.now())
+        return [self._tasks[task_id] for task_id in sorted(overdue_ids)]
     
     def get_task_statistics(self) -> Dict[str, int]:
         """
         Obtiene estadísticas de las tareas.
         
+        El resultado se reutiliza mientras no cambien las tareas y el reloj
+        siga entre el último vencimiento ya pasado y el próximo, aunque
+        retroceda (p. ej. al corregirse la hora del sistema).
+        
         Returns:
             Dict[str, int]: Diccionario con estadísticas
         """
-        stats = {
-            "total": len(self.tasks),
-            "pendiente": 0,
-            "en_progreso": 0,
-            "completada": 0,
-            "vencidas": len(self.get_overdue_tasks())
-        }
+        now = datetime.now()
+        cache = self._stats_cache
+        if cache is not None:
+            version, valid_from, valid_until, stats = cache
+            if (version == self._version
+                    and (valid_from is None or now > valid_from)
+                    and (valid_until is None or now <= valid_until)):
+                return dict(stats)
+        
+        stats = {"total": len(self._tasks)}
+        for status, ids in self._by_status.items():
+            stats[status] = len(ids)
+        
+        stats["vencidas"] = len(self._overdue_ids(now))
         
-        for task in self.tasks:
-            stats[task.status] += 1
+        # El recuento de vencidas solo cambia al pasar el próximo vencimiento
+        # o si el reloj vuelve a antes del último ya pasado
+        cut = bisect_left(self._due_index, (now,))
+        valid_from = self._due_index[cut - 1][0] if cut > 0 else None
+        valid_until = self._due_index[cut][0] if cut < len(self._due_index) else None
+        self._stats_cache = (self._version, valid_from, valid_until, stats)
+        return dict(stats)
+    
+    def _storage_for(self, filename: Optional[str]) -> Storage:
+        """
+        Obtiene el almacenamiento correspondiente a un nombre de archivo.
         
-        return stats
+        Args:
+            filename (Optional[str]): Archivo de exportación o importación
+            
+        Returns:
+            Storage: El almacenamiento del gestor si filename es None o es
+                data_file; si no, uno nuevo sobre ese archivo
+        """
+        if filename is None or filename == self.data_file:
+            return self.storage
+        return FileStorage(filename)
     
-    def save_to_file(self, filename: str = None) -> bool:
+    def save_to_file(self, filename: str = None, pretty: bool = False) -> bool:
         """
-        Guarda las tareas en un archivo JSON.
+        Guarda las tareas en un archivo JSON, o MessagePack si su nombre
+        termina en ".msgpack".
+        
+        Sin filename se usa el almacenamiento del gestor. Guardar en él
+        escribe el estado completo y descarta el diario; exportar a otro
+        archivo no toca el diario de ese archivo.
         
         Args:
             filename (str): Nombre del archivo (opcional)
+            pretty (bool): Si es True, indenta el JSON para lectura humana
             
         Returns:
             bool: True si se guardó correctamente
         """
         try:
-            file_to_use = filename or self.data_file
+            storage = self._storage_for(filename)
+            # En binario, las fechas de vencimiento van como enteros
+            if storage.name.endswith(MSGPACK_SUFFIX):
+                as_dict = Task._as_binary_dict
+            else:
+                as_dict = Task._as_dict
             data = {
                 "next_id": self.next_id,
-                "tasks": [task.to_dict() for task in self.tasks]
+                "tasks": [as_dict(task) for task in self._tasks.values()]
             }
             
-            with open(file_to_use, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            payload = _dumps(data, storage.name, pretty)
+            storage.write(payload)
+            
+            if storage is self.storage:
+                # La copia completa ya contiene todos los cambios del diario
+                storage.clear_journal()
+                self._snapshot_size = len(payload)
+                self._journal_size = 0
+                self._dirty = False
+                self._needs_snapshot = False
             
             return True
         except Exception as e:
@@ -236,7 +684,10 @@ class TaskManager:
     
     def load_from_file(self, filename: str = None) -> bool:
         """
-        Carga las tareas desde un archivo JSON.
+        Carga las tareas desde un archivo JSON, o MessagePack si su nombre
+        termina en ".msgpack", y reaplica su diario, si existe.
+        
+        Sin filename se usa el almacenamiento del gestor.
         
         Args:
             filename (str): Nombre del archivo (opcional)
@@ -244,28 +695,48 @@ class TaskManager:
         Returns:
             bool: True si se cargó correctamente
         """
+        storage = self._storage_for(filename)
+        is_own = storage is self.storage
         try:
-            file_to_use = filename or self.data_file
-            
-            if not os.path.exists(file_to_use):
+            raw = storage.read()
+            if raw is None:
+                if is_own:
+                    # Sin copia completa, el primer cambio debe escribirla
+                    self._needs_snapshot = True
                 return True  # Archivo no existe, no es error
             
-            with open(file_to_use, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            self.next_id = data.get("next_id", 1)
-            self.tasks = []
+            data = _loads(raw, storage.name)
             
+            tasks = {}
             for task_data in data.get("tasks", []):
                 task = Task.from_dict(task_data)
-                self.tasks.append(task)
-                # Actualizar next_id si es necesario
-                if task.id >= self.next_id:
-                    self.next_id = task.id + 1
+                tasks[task.id] = task
+            # El próximo ID nunca puede repetir uno ya usado
+            next_id = max(data.get("next_id", 1), max(tasks, default=0) + 1)
+            
+            journal = storage.read_journal()
+            journal_complete = True
+            if journal:
+                next_id, journal_complete = self._replay_journal(journal, tasks, next_id)
             
+            self.next_id = next_id
+            self._set_tasks(tasks)
+            if is_own:
+                self._snapshot_size = len(raw)
+                self._journal_size = len(journal)
+                self._dirty = False
+                # Tras una línea inválida no se puede seguir añadiendo al diario:
+                # el siguiente cambio reescribe la copia completa y lo descarta
+                self._needs_snapshot = not journal_complete
+            else:
+                # Importación: data_file ya no refleja el estado en memoria
+                self._dirty = True
             return True
         except Exception as e:
             print(f"Error al cargar archivo: {e}")
+            if is_own:
+                # No aplicar el diario sobre un archivo ilegible: reescribirlo
+                self._needs_snapshot = True
             return False
     
     def clear_all_tasks(self) -> bool:
@@ -275,24 +746,58 @@ class TaskManager:
         Returns:
             bool: True si se eliminaron correctamente
         """
-        self.tasks.clear()
+        self._set_tasks({})
         self.next_id = 1
-        self.save_to_file()
+        self._record_change({"op": "clear"})
         return True
     
     def search_tasks(self, query: str) -> List[Task]:
         """
         Busca tareas por nombre o descripción.
         
+        Las consultas de 3 o más caracteres usan el índice de trigramas para
+        descartar candidatas; las más cortas recorren todas las tareas. Los
+        resultados se reutilizan mientras las tareas no cambien.
+        
         Args:
             query (str): Texto a buscar
             
         Returns:
             List[Task]: Lista de tareas que coinciden con la búsqueda
         """
-        query = query.lower()
-        return [task for task in self.tasks 
-                if query in task.name.lower() or query in task.description.lower()]
+        if self._search_version != self._version:
+            self._cached_search.cache_clear()
+            self._search_version = self._version
+        return list(self._cached_search(query.lower()))
+    
+    def _search_uncached(self, query: str) -> Tuple[Task, ...]:
+        """
+        Realiza la búsqueda sin caché.
+        
+        Args:
+            query (str): Texto a buscar, ya en minúsculas
+            
+        Returns:
+            Tuple[Task, ...]: Tareas que coinciden con la búsqueda
+        """
+        if len(query) < 3:
+            return tuple(task for task in self._tasks.values() 
+                         if query in task._name_lower or query in task._description_lower)
+        
+        postings = []
+        for gram in _trigrams(query):
+            ids = self._trigram_index.get(gram)
+            if not ids:
+                return ()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        
+        # Verificar candidatas: los trigramas pueden venir de campos distintos.
+        # Los IDs crecen con cada creación, así que ordenarlos conserva el orden.
+        candidate_tasks = [self._tasks[task_id] for task_id in sorted(candidates)]
+        return tuple(task for task in candidate_tasks 
+                     if query in task._name_lower or query in task._description_lower)
     
     def __len__(self) -> int:
         """
@@ -301,7 +806,7 @@ class TaskManager:
         Returns:
             int: Número de tareas
         """
-        return len(self.tasks)
+        return len(self._tasks)
     
     def __str__(self) -> str:
         """
@@ -5,8 +5,32 @@ Este módulo contiene funciones de ayuda para formatear fechas,
 validar datos, y mostrar información de manera ordenada.
 """
 
+import re
 from datetime import datetime
 from typing import List, Optional
+from .task import Task
+
+
+# Estados válidos de una tarea, tomados del modelo para no mantener otra copia
+VALID_STATUSES = frozenset(Task.VALID_STATUSES)
+
+# Encabezado y separador de la tabla de tareas (invariantes entre llamadas)
+_TABLE_HEADER = f"\n{'ID':<4} {'Estado':<12} {'Nombre':<25} {'Descripción':<30} {'Vencimiento':<15}"
+_TABLE_RULE = "-" * 90
+# Plantilla de fila precompilada: id, estado, nombre, descripción, vencimiento, prioridad
+_format_row = "{:<4} {:<12} {:<25} {:<30} {:<15} {}".format
+# Respuestas aceptadas como confirmación
+YES_RESPONSES = frozenset({"s", "si", "sí", "y", "yes"})
+
+# Iconos por estado de tarea
+_STATUS_ICONS = {
+    "pendiente": "⏳",
+    "en_progreso": "🔄",
+    "completada": "✅"
+}
+# Fechas aceptadas por parse_date: YYYY-MM-DD con hora HH:MM opcional,
+# separada por cualquier cantidad de espacios (como en strptime)
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:\s+(\d{1,2}):(\d{1,2}))?")
 
 
 def format_date(date: datetime) -> str:
@@ -19,7 +43,7 @@ def format_date(date: datetime) -> str:
     Returns:
         str: Fecha formateada como YYYY-MM-DD
     """
-    return date.strftime("%Y-%m-%d")
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d}"
 
 
 def format_datetime(date: datetime) -> str:
@@ -32,7 +56,8 @@ def format_datetime(date: datetime) -> str:
     Returns:
         str: Fecha y hora formateada como YYYY-MM-DD HH:MM
     """
-    return date.strftime("%Y-%m-%d %H:%M")
+    return (f"{date.year:04d}-{date.month:02d}-{date.day:02d} "
+            f"{date.hour:02d}:{date.minute:02d}")
 
 
 def parse_date(date_str: str) -> Optional[datetime]:
@@ -45,14 +70,14 @@ def parse_date(date_str: str) -> Optional[datetime]:
     Returns:
         Optional[datetime]: Objeto datetime si es válido, None en caso contrario
     """
+    match = _DATE_RE.fullmatch(date_str)
+    if match is None:
+        return None
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
+        # Los grupos de hora y minuto son None si la fecha no incluye hora
+        return datetime(*(int(part) for part in match.groups() if part is not None))
     except ValueError:
-        try:
-            # Intentar formato con hora
-            return datetime.strptime(date_str, "%Y-%m-%d %H:%M")
-        except ValueError:
-            return None
+        return None  # Fuera de rango, p. ej. mes 13 o 30 de febrero
 
 
 def validate_status(status: str) -> bool:
@@ -65,8 +90,7 @@ def validate_status(status: str) -> bool:
     Returns:
         bool: True si es válido, False en caso contrario
     """
-    valid_statuses = ["pendiente", "en_progreso", "completada"]
-    return status.lower() in valid_statuses
+    return status.lower() in VALID_STATUSES
 
 
 def get_status_icon(status: str) -> str:
@@ -79,12 +103,7 @@ def get_status_icon(status: str) -> str:
     Returns:
         str: Icono correspondiente al estado
     """
-    icons = {
-        "pendiente": "⏳",
-        "en_progreso": "🔄",
-        "completada": "✅"
-    }
-    return icons.get(status.lower(), "❓")
+    return _STATUS_ICONS.get(status.lower(), "❓")
 
 
 def get_priority_color(days_until_due: int) -> str:
@@ -107,6 +126,27 @@ def get_priority_color(days_until_due: int) -> str:
         return "🟢"  # Normal
 
 
+def truncate_text(text: str, max_length: int) -> str:
+    """
+    Recorta un texto largo añadiendo puntos suspensivos.
+    
+    Args:
+        text (str): Texto a recortar
+        max_length (int): Longitud máxima antes de recortar
+        
+    Returns:
+        str: El texto original o sus primeros caracteres seguidos de "..."
+    """
+    return text if len(text) <= max_length else text[:max_length] + "..."
+
+
+# Celdas de estado ya formateadas ("icono estado") para la tabla de tareas
+_STATUS_CELLS = {
+    status: f"{get_status_icon(status)} {status}"
+    for status in VALID_STATUSES
+}
+
+
 def display_tasks_table(tasks: List) -> None:
     """
     Muestra las tareas en formato de tabla simple.
@@ -118,29 +158,23 @@ def display_tasks_table(tasks: List) -> None:
         print("📝 No hay tareas para mostrar.")
         return
     
-    print(f"\n{'ID':<4} {'Estado':<12} {'Nombre':<25} {'Descripción':<30} {'Vencimiento':<15}")
-    print("-" * 90)
-    
     now = datetime.now()
     
-    for task in tasks:
-        # Calcular días hasta vencimiento
-        days_until = (task.due_date - now).days
-        priority_icon = get_priority_color(days_until)
-        
-        # Truncar descripción si es muy larga
-        description = task.description
-        if len(description) > 27:
-            description = description[:27] + "..."
-        
-        # Truncar nombre si es muy largo
-        name = task.name
-        if len(name) > 22:
-            name = name[:22] + "..."
-        
-        status_display = f"{get_status_icon(task.status)} {task.status}"
-        
-        print(f"{task.id:<4} {status_display:<12} {name:<25} {description:<30} {format_date(task.due_date):<15} {priority_icon}")
+    rows = [_TABLE_HEADER, _TABLE_RULE]
+    rows += [
+        _format_row(
+            task.id,
+            _STATUS_CELLS.get(task.status) or f"{get_status_icon(task.status)} {task.status}",
+            truncate_text(task.name, 22),
+            truncate_text(task.description, 27),
+            format_date(task.due_date),
+            # Prioridad calculada a partir de los días hasta el vencimiento
+            get_priority_color((task.due_date - now).days)
+        )
+        for task in tasks
+    ]
+    # Una sola escritura para encabezado y filas
+    print("\n".join(rows))
 
 
 def display_task_details(task) -> None:
@@ -150,26 +184,29 @@ def display_task_details(task) -> None:
     Args:
         task (Task): Tarea a mostrar
     """
-    print(f"\n📋 DETALLES DE LA TAREA #{task.id}")
-    print("=" * 40)
-    print(f"Nombre: {task.name}")
-    print(f"Descripción: {task.description}")
-    print(f"Estado: {get_status_icon(task.status)} {task.status}")
-    print(f"Fecha de vencimiento: {format_date(task.due_date)}")
-    print(f"Fecha de creación: {format_datetime(task.created_at)}")
+    lines = [
+        f"\n📋 DETALLES DE LA TAREA #{task.id}",
+        "=" * 40,
+        f"Nombre: {task.name}",
+        f"Descripción: {task.description}",
+        f"Estado: {get_status_icon(task.status)} {task.status}",
+        f"Fecha de vencimiento: {format_date(task.due_date)}",
+        f"Fecha de creación: {format_datetime(task.created_at)}",
+    ]
     
     # Calcular días hasta vencimiento
     now = datetime.now()
     days_until = (task.due_date - now).days
     
     if days_until < 0:
-        print(f"⚠️  VENCIDA hace {abs(days_until)} día(s)")
+        lines.append(f"⚠️  VENCIDA hace {abs(days_until)} día(s)")
     elif days_until == 0:
-        print("⚠️  VENCE HOY")
+        lines.append("⚠️  VENCE HOY")
     elif days_until == 1:
-        print("🟠 Vence mañana")
+        lines.append("🟠 Vence mañana")
     else:
-        print(f"📅 Vence en {days_until} día(s)")
+        lines.append(f"📅 Vence en {days_until} día(s)")
+    print("\n".join(lines))
 
 
 def validate_task_input(name: str, description: str = "") -> bool:
@@ -208,8 +245,7 @@ def confirm_action(message: str) -> bool:
     Returns:
         bool: True si el usuario confirma, False en caso contrario
     """
-    response = input(f"{message} (s/N): ").strip().lower()
-    return response == 's' or response == 'si'
+    return input(f"{message} (s/N): ").strip().lower() in YES_RESPONSES
 
 
 def print_header(title: str) -> None:
@@ -0,0 +1,39 @@
+"""
+Configuración compartida de pytest para las pruebas del Sistema de Gestión de Tareas.
+
+Define opciones de línea de comandos y fixtures comunes a varios módulos
+de prueba.
+"""
+
+import pytest
+import time_machine
+from datetime import datetime
+
+
+# Instante fijo usado como "ahora" en las pruebas que congelan el reloj
+FROZEN_NOW = datetime(2024, 12, 20, 9, 0)
+
+
+def pytest_configure(config):
+    """Registra los marcadores propios del proyecto."""
+    config.addinivalue_line(
+        "markers",
+        "persistence: la prueba usa un TaskManager guardado en archivo en lugar de en memoria"
+    )
+
+
+def pytest_addoption(parser):
+    """Registra --all-combinations para ejecutar las matrices de parámetros completas."""
+    parser.addoption(
+        "--all-combinations",
+        action="store_true",
+        default=False,
+        help="ejecutar todas las combinaciones de parámetros en lugar de cubrir cada valor una vez"
+    )
+
+
+@pytest.fixture
+def frozen_now():
+    """Congela datetime.now() en FROZEN_NOW durante la prueba y lo devuelve."""
+    with time_machine.travel(FROZEN_NOW, tick=False):
+        yield FROZEN_NOW
@@ -7,7 +7,6 @@ entre todos los componentes del sistema.
 
 import pytest
 import os
-import tempfile
 import json
 from datetime import datetime, timedelta
 import sys
@@ -16,24 +15,24 @@ from unittest.mock import patch
 
 from src.task_manager import TaskManager
 from src.task import Task
-from src.cli import TaskCLI
+from src.storage import MemoryStorage
+from src.cli import TaskCLI, main
+
+
+@pytest.fixture(scope="class")
+def data_dir(tmp_path_factory):
+    """Directorio temporal compartido por todas las pruebas de la clase."""
+    return tmp_path_factory.mktemp("integracion")
 
 
 class TestIntegration:
     """Pruebas de integración del sistema completo."""
     
-    def setup_method(self):
-        """Configuración antes de cada prueba."""
-        # Crear archivo temporal para las pruebas
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-        self.temp_file.close()
-        self.task_manager = TaskManager(data_file=self.temp_file.name)
-    
-    def teardown_method(self):
-        """Limpieza después de cada prueba."""
-        # Eliminar archivo temporal
-        if os.path.exists(self.temp_file.name):
-            os.unlink(self.temp_file.name)
+    @pytest.fixture(autouse=True)
+    def setup_task_manager(self, data_dir, request):
+        """Configuración antes de cada prueba: un archivo de datos propio."""
+        self.data_file = str(data_dir / f"{request.node.name}.json")
+        self.task_manager = TaskManager(data_file=self.data_file)
     
     def test_complete_workflow(self):
         """✅ test_complete_workflow: Prueba el flujo completo del sistema"""
@@ -138,7 +137,7 @@ class TestIntegration:
     def test_data_persistence(self):
         """✅ test_data_persistence: Verifica la persistencia entre sesiones"""
         # Sesión 1: Crear y modificar tareas
-        session1_manager = TaskManager(data_file=self.temp_file.name)
+        session1_manager = TaskManager(data_file=self.data_file)
         
         # Crear tareas con datos complejos
         task1 = session1_manager.create_task(
@@ -166,7 +165,7 @@ class TestIntegration:
         session1_tasks = session1_manager.list_tasks()
         
         # Sesión 2: Cargar datos desde archivo
-        session2_manager = TaskManager(data_file=self.temp_file.name)
+        session2_manager = TaskManager(data_file=self.data_file)
         
         # Verificar que los datos se cargaron correctamente
         session2_tasks = session2_manager.list_tasks()
@@ -199,7 +198,7 @@ class TestIntegration:
         assert task3.id == 3  # Debe continuar la secuencia
         
         # Sesión 4: Verificar persistencia final
-        session3_manager = TaskManager(data_file=self.temp_file.name)
+        session3_manager = TaskManager(data_file=self.data_file)
         final_tasks = session3_manager.list_tasks()
         
         assert len(final_tasks) == 3
@@ -208,8 +207,7 @@ class TestIntegration:
     def test_cli_integration(self):
         """✅ test_cli_integration: Verifica la integración con la interfaz CLI"""
         # Crear una instancia del CLI con nuestro TaskManager
-        cli = TaskCLI()
-        cli.task_manager = self.task_manager  # Usar nuestro manager de prueba
+        cli = TaskCLI(task_manager=self.task_manager)
         
         # Simular creación de tarea a través del CLI
         with patch('builtins.input', side_effect=[
@@ -264,6 +262,32 @@ class TestIntegration:
         # Verificar eliminación
         assert len(cli.task_manager.list_tasks()) == 0
     
+    def test_cli_assume_yes(self):
+        """Verifica que --yes elimina sin pedir confirmación"""
+        # Arrange
+        cli = TaskCLI(assume_yes=True, task_manager=self.task_manager)
+        task = self.task_manager.create_task(name="Tarea a eliminar")
+        
+        # Act - Solo se pide el ID, no la confirmación
+        with patch('builtins.input', side_effect=[str(task.id)]):
+            cli.delete_task()
+        
+        # Assert
+        assert len(self.task_manager.list_tasks()) == 0
+    
+    def test_main_uses_injected_manager(self):
+        """Verifica que main() trabaja sobre el gestor recibido"""
+        # Arrange
+        self.task_manager.create_task(name="Tarea inyectada")
+        
+        # Act - Listar tareas y salir
+        with patch('builtins.input', side_effect=["2", "0"]):
+            with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                main(["--yes"], task_manager=self.task_manager)
+        
+        # Assert
+        assert "Tarea inyectada" in mock_stdout.getvalue()
+    
     def test_error_handling(self):
         """✅ test_error_handling: Verifica el manejo de errores"""
         # 1. Error al crear tarea con nombre vacío
@@ -291,11 +315,11 @@ class TestIntegration:
         
         # 5. Manejo de archivo corrupto
         # Escribir JSON inválido
-        with open(self.temp_file.name, 'w') as f:
+        with open(self.data_file, 'w') as f:
             f.write("json inválido {")
         
         # Crear nuevo manager con archivo corrupto
-        corrupted_manager = TaskManager(data_file=self.temp_file.name)
+        corrupted_manager = TaskManager(data_file=self.data_file)
         
         # Debe inicializar con estado limpio
         assert len(corrupted_manager.list_tasks()) == 0
@@ -380,7 +404,7 @@ class TestIntegration:
         assert len(overdue_pending) == 1
         assert overdue_pending[0].id == task_past.id
     
-    def test_export_import_integration(self):
+    def test_export_import_integration(self, tmp_path):
         """Verifica la funcionalidad de exportar/importar"""
         # Crear datos de prueba
         original_tasks = []
@@ -403,86 +427,83 @@ class TestIntegration:
             status="pendiente"
         ))
         
-        # Crear archivo de exportación
-        export_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-        export_file.close()
-        
-        try:
-            # Exportar tareas
-            success = self.task_manager.save_to_file(export_file.name)
-            assert success is True
-            
-            # Verificar que el archivo de exportación existe y tiene contenido
-            assert os.path.exists(export_file.name)
-            
-            with open(export_file.name, 'r') as f:
-                export_data = json.load(f)
-            
-            assert "tasks" in export_data
-            assert "next_id" in export_data
-            assert len(export_data["tasks"]) == 3
-            assert export_data["next_id"] == 4
-            
-            # Crear nuevo manager e importar
-            import_manager = TaskManager(data_file="dummy_file.json")  # Archivo que no existe
-            
-            success = import_manager.load_from_file(export_file.name)
-            assert success is True
-            
-            # Verificar que los datos se importaron correctamente
-            imported_tasks = import_manager.list_tasks()
-            assert len(imported_tasks) == 3
-            assert import_manager.next_id == 4
-            
-            # Verificar datos específicos
-            for original_task in original_tasks:
-                imported_task = import_manager.get_task_by_id(original_task.id)
-                assert imported_task is not None
-                assert imported_task.name == original_task.name
-                assert imported_task.description == original_task.description
-                assert imported_task.status == original_task.status
-                # Las fechas deberían ser iguales (con pequeña tolerancia por serialización)
-                time_diff = abs((imported_task.due_date - original_task.due_date).total_seconds())
-                assert time_diff < 1  # Menos de 1 segundo de diferencia
-                
-        finally:
-            # Limpiar archivo de exportación
-            if os.path.exists(export_file.name):
-                os.unlink(export_file.name)
+        # Archivo de exportación
+        export_file = str(tmp_path / "export.json")
+        
+        # Exportar tareas
+        success = self.task_manager.save_to_file(export_file)
+        assert success is True
+        
+        # Verificar que el archivo de exportación existe y tiene contenido
+        assert os.path.exists(export_file)
+        
+        with open(export_file, 'r') as f:
+            export_data = json.load(f)
+        
+        assert "tasks" in export_data
+        assert "next_id" in export_data
+        assert len(export_data["tasks"]) == 3
+        assert export_data["next_id"] == 4
+        
+        # Crear nuevo manager e importar
+        import_manager = TaskManager(data_file=str(tmp_path / "import.json"))  # Archivo que no existe
+        
+        success = import_manager.load_from_file(export_file)
+        assert success is True
+        
+        # Verificar que los datos se importaron correctamente
+        imported_tasks = import_manager.list_tasks()
+        assert len(imported_tasks) == 3
+        assert import_manager.next_id == 4
+        
+        # Verificar datos específicos
+        for original_task in original_tasks:
+            imported_task = import_manager.get_task_by_id(original_task.id)
+            assert imported_task is not None
+            assert imported_task.name == original_task.name
+            assert imported_task.description == original_task.description
+            assert imported_task.status == original_task.status
+            # Las fechas deberían ser iguales (con pequeña tolerancia por serialización)
+            time_diff = abs((imported_task.due_date - original_task.due_date).total_seconds())
+            assert time_diff < 1  # Menos de 1 segundo de diferencia
     
     def test_large_dataset_performance(self):
         """Verifica el rendimiento con un conjunto grande de datos"""
         import time
         
+        # En memoria: se mide el gestor, no la latencia del disco
+        task_manager = TaskManager(storage=MemoryStorage())
+        
         # Crear muchas tareas
         num_tasks = 100
         start_time = time.time()
         
-        for i in range(num_tasks):
-            self.task_manager.create_task(
-                name=f"Tarea {i+1}",
-                description=f"Descripción de la tarea número {i+1}",
-                status=["pendiente", "en_progreso", "completada"][i % 3]
-            )
+        with task_manager.batch():
+            for i in range(num_tasks):
+                task_manager.create_task(
+                    name=f"Tarea {i+1}",
+                    description=f"Descripción de la tarea número {i+1}",
+                    status=["pendiente", "en_progreso", "completada"][i % 3]
+                )
         
         creation_time = time.time() - start_time
         
         # Verificar que se crearon todas las tareas
-        assert len(self.task_manager.list_tasks()) == num_tasks
+        assert len(task_manager.list_tasks()) == num_tasks
         
         # Probar operaciones de búsqueda y filtrado
         start_time = time.time()
         
         # Filtrar por estado
-        pendientes = self.task_manager.get_tasks_by_status("pendiente")
-        en_progreso = self.task_manager.get_tasks_by_status("en_progreso")
-        completadas = self.task_manager.get_tasks_by_status("completada")
+        pendientes = task_manager.get_tasks_by_status("pendiente")
+        en_progreso = task_manager.get_tasks_by_status("en_progreso")
+        completadas = task_manager.get_tasks_by_status("completada")
         
         # Búsqueda por texto
-        search_results = self.task_manager.search_tasks("Tarea 50")
+        search_results = task_manager.search_tasks("Tarea 50")
         
         # Obtener estadísticas
-        stats = self.task_manager.get_task_statistics()
+        stats = task_manager.get_task_statistics()
         
         search_time = time.time() - start_time
         
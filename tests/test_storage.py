@@ -0,0 +1,84 @@
+"""
+Pruebas unitarias para los almacenamientos de tareas.
+
+Este módulo contiene las pruebas para verificar el correcto funcionamiento
+de FileStorage y MemoryStorage, y su uso desde TaskManager.
+"""
+
+import pytest
+import os
+from src.storage import Storage, FileStorage, MemoryStorage
+from src.task_manager import TaskManager
+
+
+class TestFileStorage:
+    """Pruebas para la clase FileStorage."""
+    
+    def test_read_missing_file(self, tmp_path):
+        """Verifica que un archivo inexistente se lee como None"""
+        # Arrange
+        storage = FileStorage(str(tmp_path / "tasks.json"))
+        
+        # Act & Assert
+        assert storage.read() is None
+        assert storage.read_journal() == b""
+    
+    def test_write_and_journal(self, tmp_path):
+        """Verifica la escritura completa y el diario de cambios"""
+        # Arrange
+        path = str(tmp_path / "tasks.json")
+        storage = FileStorage(path)
+        
+        # Act
+        storage.write(b'{"tasks": []}')
+        storage.append(b'{"op": "clear"}\n')
+        journal = storage.read_journal()
+        storage.clear_journal()
+        
+        # Assert
+        assert storage.read() == b'{"tasks": []}'
+        assert journal == b'{"op": "clear"}\n'
+        assert not os.path.exists(path + ".log")
+        assert not os.path.exists(path + ".tmp")
+
+
+class TestStorage:
+    """Pruebas para la interfaz Storage."""
+    
+    def test_incomplete_subclass_cannot_be_instantiated(self):
+        """Verifica que una subclase sin todos los métodos no se puede crear"""
+        # Arrange
+        class ReadOnlyStorage(Storage):
+            name = "solo_lectura.json"
+            
+            def read(self):
+                return None
+        
+        # Act & Assert
+        with pytest.raises(TypeError):
+            ReadOnlyStorage()
+
+
+class TestMemoryStorage:
+    """Pruebas para la clase MemoryStorage."""
+    
+    def test_task_manager_round_trip(self):
+        """Verifica que un TaskManager en memoria conserva los datos entre instancias"""
+        # Arrange
+        storage = MemoryStorage()
+        manager = TaskManager(storage=storage)
+        
+        # Act
+        task = manager.create_task(name="Tarea en memoria")
+        manager.update_task(task.id, status="completada")
+        reloaded = TaskManager(storage=storage)
+        
+        # Assert
+        assert storage.data is not None
+        assert reloaded.get_task_by_id(task.id).status == "completada"
+        assert reloaded.next_id == 2
+        assert reloaded.data_file == "memoria.json"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -6,117 +6,119 @@ de la clase Task y sus métodos.
 """
 
 import pytest
+import copy
+import pickle
 from datetime import datetime, timedelta
 from src.task import Task
 
 
+# Ciclo de vida de una tarea: argumentos del constructor, de update() (o None)
+# y atributos esperados al final
+LIFECYCLE_CASES = [
+    (
+        dict(id=1, name="Tarea de prueba", description="Descripción de prueba",
+             due_date=datetime(2024, 12, 21, 9, 0), status="pendiente"),
+        None,
+        dict(id=1, name="Tarea de prueba", description="Descripción de prueba",
+             due_date=datetime(2024, 12, 21, 9, 0), status="pendiente"),
+    ),
+    (
+        dict(id=1, name="Tarea básica"),
+        None,
+        dict(id=1, name="Tarea básica", description="", status="pendiente"),
+    ),
+    (
+        dict(id=1, name="Tarea", description=""),
+        None,
+        dict(description=""),
+    ),
+    (
+        dict(id=1, name="Tarea original", description="Descripción original"),
+        dict(name="Tarea actualizada", description="Nueva descripción",
+             status="en_progreso", due_date=datetime(2024, 12, 22, 9, 0)),
+        dict(name="Tarea actualizada", description="Nueva descripción",
+             status="en_progreso", due_date=datetime(2024, 12, 22, 9, 0)),
+    ),
+    (
+        dict(id=1, name="Tarea original", description="Descripción original"),
+        dict(status="completada"),
+        dict(name="Tarea original", description="Descripción original", status="completada"),
+    ),
+]
+
+# Fechas fijas de vencimiento y creación de las pruebas de serialización
+_DUE = datetime(2024, 12, 25, 10, 30)
+_CREATED = datetime(2024, 12, 20, 9, 0)
+
+# Diccionario que debe producir la tarea de test_task_to_dict
+EXPECTED_DICT = {
+    "id": 1,
+    "name": "Tarea de prueba",
+    "description": "Descripción",
+    "due_date": _DUE.isoformat(),
+    "status": "pendiente",
+    "created_at": _CREATED.isoformat()
+}
+
+
 class TestTask:
     """Pruebas para la clase Task."""
     
-    def test_task_creation(self):
-        """✅ test_task_creation: Verifica la creación correcta de tareas"""
-        # Arrange
-        task_id = 1
-        name = "Tarea de prueba"
-        description = "Descripción de prueba"
-        due_date = datetime.now() + timedelta(days=1)
-        status = "pendiente"
-        
-        # Act
-        task = Task(
-            id=task_id,
-            name=name,
-            description=description,
-            due_date=due_date,
-            status=status
-        )
-        
-        # Assert
-        assert task.id == task_id
-        assert task.name == name
-        assert task.description == description
-        assert task.due_date == due_date
-        assert task.status == status
-        assert isinstance(task.created_at, datetime)
-    
-    def test_task_creation_with_defaults(self):
-        """Verifica la creación de tareas con valores por defecto"""
+    @pytest.mark.parametrize(
+        "init_kwargs, update_kwargs, expected",
+        LIFECYCLE_CASES,
+        ids=["creacion", "valores_por_defecto", "descripcion_vacia",
+             "actualizacion", "actualizacion_parcial"]
+    )
+    def test_task_lifecycle(self, init_kwargs, update_kwargs, expected):
+        """✅ test_task_lifecycle: Verifica la creación y actualización de tareas"""
         # Arrange & Act
-        task = Task(id=1, name="Tarea básica")
+        task = Task(**init_kwargs)
+        if update_kwargs is not None:
+            task.update(**update_kwargs)
         
-        # Assert
-        assert task.id == 1
-        assert task.name == "Tarea básica"
-        assert task.description == ""
-        assert task.status == "pendiente"
+        # Assert - Los atributos no indicados en update() no cambian
+        for attr, value in expected.items():
+            assert getattr(task, attr) == value
         assert isinstance(task.due_date, datetime)
         assert isinstance(task.created_at, datetime)
     
-    def test_task_update(self):
-        """✅ test_task_update: Verifica la actualización de atributos"""
-        # Arrange
-        task = Task(id=1, name="Tarea original", description="Descripción original")
-        new_name = "Tarea actualizada"
-        new_description = "Nueva descripción"
-        new_status = "en_progreso"
-        new_due_date = datetime.now() + timedelta(days=2)
-        
-        # Act
-        task.update(
-            name=new_name,
-            description=new_description,
-            status=new_status,
-            due_date=new_due_date
-        )
-        
-        # Assert
-        assert task.name == new_name
-        assert task.description == new_description
-        assert task.status == new_status
-        assert task.due_date == new_due_date
-    
-    def test_task_update_partial(self):
-        """Verifica la actualización parcial de atributos"""
-        # Arrange
-        original_name = "Tarea original"
-        original_description = "Descripción original"
-        task = Task(id=1, name=original_name, description=original_description)
-        
-        # Act - Solo actualizar el estado
-        task.update(status="completada")
-        
-        # Assert
-        assert task.name == original_name  # No cambia
-        assert task.description == original_description  # No cambia
-        assert task.status == "completada"  # Cambia
-    
     def test_task_to_dict(self):
         """✅ test_task_to_dict: Verifica la conversión a diccionario"""
         # Arrange
-        due_date = datetime(2024, 12, 25, 10, 30)
-        created_at = datetime(2024, 12, 20, 9, 0)
         task = Task(
             id=1,
             name="Tarea de prueba",
             description="Descripción",
-            due_date=due_date,
+            due_date=_DUE,
             status="pendiente"
         )
-        task.created_at = created_at  # Simular fecha de creación específica
+        task.created_at = _CREATED  # Simular fecha de creación específica
         
         # Act
         task_dict = task.to_dict()
         
         # Assert
-        expected_dict = {
-            "id": 1,
-            "name": "Tarea de prueba",
-            "description": "Descripción",
-            "due_date": due_date.isoformat(),
-            "status": "pendiente",
-            "created_at": created_at.isoformat()
-        }
-        assert task_dict == expected_dict
+        assert task_dict == EXPECTED_DICT
+    
+    def test_task_to_dict_reflects_changes(self):
+        """Verifica que to_dict refleja los cambios y devuelve copias independientes"""
+        # Arrange
+        task = Task(id=1, name="Original", due_date=datetime(2024, 12, 25))
+        first = task.to_dict()
+        first["name"] = "Modificado fuera"
+        
+        # Act
+        unchanged = task.to_dict()
+        task.update(name="Nuevo", status="completada")
+        task.due_date = datetime(2025, 1, 1)
+        changed = task.to_dict()
+        
+        # Assert
+        assert unchanged["name"] == "Original"
+        assert changed["name"] == "Nuevo"
+        assert changed["status"] == "completada"
+        assert changed["due_date"] == datetime(2025, 1, 1).isoformat()
     
     def test_task_from_dict(self):
         """✅ test_task_from_dict: Verifica la creación desde diccionario"""
@@ -138,70 +140,136 @@ class TestTask:
         assert task.name == "Tarea desde dict"
         assert task.description == "Descripción desde dict"
         assert task.status == "en_progreso"
-        assert task.due_date == datetime.fromisoformat("2024-12-25T10:30:00")
-        assert task.created_at == datetime.fromisoformat("2024-12-20T09:00:00")
+        assert task.due_date == _DUE
+        assert task.created_at == _CREATED
     
-    def test_invalid_status(self):
-        """✅ test_invalid_status: Verifica validación de estados"""
-        # Test 1: Estado inválido en creación
-        with pytest.raises(ValueError, match="Estado inválido"):
-            Task(id=1, name="Tarea", status="estado_invalido")
+    def test_task_from_dict_epoch_microseconds(self):
+        """Verifica que from_dict acepta fechas como microsegundos enteros"""
+        # Arrange
+        due_date = datetime(2024, 12, 25, 15, 30, 0, 123456)
+        microseconds = (due_date - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+        task_data = {
+            "id": 3,
+            "name": "Tarea binaria",
+            "due_date": microseconds,
+            "status": "pendiente",
+            "created_at": microseconds
+        }
         
-        # Test 2: Estado inválido en actualización
-        task = Task(id=1, name="Tarea")
-        with pytest.raises(ValueError, match="Estado inválido"):
-            task.update(status="estado_invalido")
-    
-    def test_valid_statuses(self):
-        """Verifica que todos los estados válidos funcionan"""
-        valid_statuses = ["pendiente", "en_progreso", "completada"]
-        
-        for status in valid_statuses:
-            # Crear tarea con estado válido
-            task = Task(id=1, name="Tarea", status=status)
-            assert task.status == status
-            
-            # Actualizar a estado válido
-            task.update(status=status)
-            assert task.status == status
+        # Act
+        task = Task.from_dict(task_data)
+        
+        # Assert
+        assert task.due_date == due_date
+        assert task.created_at == due_date
+        assert task._as_binary_dict()["due_date"] == microseconds
     
-    def test_task_str_representation(self):
-        """Verifica la representación en cadena de la tarea"""
+    def test_status_is_canonical(self):
+        """Verifica que tareas con el mismo estado comparten la misma cadena"""
         # Arrange
-        due_date = datetime(2024, 12, 25)
-        task = Task(id=1, name="Mi Tarea", status="pendiente", due_date=due_date)
+        loaded_status = "".join(["comp", "letada"])  # Cadena distinta, mismo valor
         
         # Act
-        str_representation = str(task)
+        created = Task(id=1, name="Creada", status="completada")
+        loaded = Task.from_dict({
+            "id": 2, "name": "Cargada", "status": loaded_status,
+            "due_date": "2024-12-25T00:00:00", "created_at": "2024-12-20T00:00:00"
+        })
+        updated = Task(id=3, name="Actualizada")
+        updated.update(status=loaded_status)
+        assigned = Task(id=4, name="Asignada")
+        assigned.status = loaded_status
         
         # Assert
-        expected = "Tarea #1: Mi Tarea [PENDIENTE] - Vence: 2024-12-25"
-        assert str_representation == expected
+        assert loaded.status is created.status
+        assert updated.status is created.status
+        assert assigned.status is created.status
     
-    def test_task_repr_representation(self):
-        """Verifica la representación técnica de la tarea"""
+    @pytest.mark.parametrize("clone", [
+        copy.copy,
+        copy.deepcopy,
+        lambda task: pickle.loads(pickle.dumps(task)),
+    ], ids=["copy", "deepcopy", "pickle"])
+    def test_task_copy_and_pickle_round_trip(self, clone):
+        """Verifica que una tarea se puede copiar y serializar con pickle"""
         # Arrange
-        due_date = datetime(2024, 12, 25)
-        task = Task(id=1, name="Mi Tarea", status="pendiente", due_date=due_date)
+        task = Task(id=1, name="Original", description="Descripción",
+                    due_date=_DUE, status="en_progreso")
+        task.created_at = _CREATED
         
         # Act
-        repr_representation = repr(task)
+        copied = clone(task)
+        copied.update(name="Copia")
         
         # Assert
-        expected = f"Task(id=1, name='Mi Tarea', status='pendiente', due_date={due_date})"
-        assert repr_representation == expected
+        assert copied is not task
+        assert task.name == "Original"
+        assert copied.to_dict() == {**task.to_dict(), "name": "Copia"}
+    
+    def test_due_date_cannot_be_none(self):
+        """Verifica que asignar None como fecha de vencimiento falla sin modificar la tarea"""
+        # Arrange
+        task = Task(id=1, name="Tarea", due_date=_DUE)
+        
+        # Act & Assert
+        with pytest.raises(ValueError, match="fecha de vencimiento"):
+            task.due_date = None
+        assert task.due_date == _DUE
     
-    def test_task_with_empty_description(self):
-        """Verifica manejo de descripción vacía"""
-        # Test con descripción vacía explícita
-        task1 = Task(id=1, name="Tarea", description="")
-        assert task1.description == ""
-        
-        # Test con descripción None (valor por defecto)
-        task2 = Task(id=2, name="Tarea")
-        assert task2.description == ""
+    @pytest.mark.parametrize("status", ["Pendiente", "x"], ids=["mayusculas", "invalido"])
+    def test_status_assignment_is_validated(self, status):
+        """Verifica que asignar un estado inválido falla y no modifica la tarea"""
+        # Arrange
+        task = Task(id=1, name="Tarea")
+        
+        # Act & Assert
+        with pytest.raises(ValueError, match="Estado inválido"):
+            task.status = status
+        assert task.status == "pendiente"
+    
+    @pytest.mark.parametrize("status", ["estado_invalido", "", "foo"],
+                             ids=["invalido", "vacio", "foo"])
+    def test_invalid_status(self, status):
+        """✅ test_invalid_status: Verifica validación de estados"""
+        # Test 1: Estado inválido en creación
+        with pytest.raises(ValueError, match="Estado inválido"):
+            Task(id=1, name="Tarea", status=status)
+        
+        # Test 2: Estado inválido en actualización
+        task = Task(id=1, name="Tarea")
+        with pytest.raises(ValueError, match="Estado inválido"):
+            task.update(status=status)
+    
+    @pytest.mark.parametrize("status", ["pendiente", "en_progreso", "completada"],
+                             ids=["pend", "prog", "done"])
+    def test_valid_statuses(self, status):
+        """Verifica que todos los estados válidos funcionan"""
+        # Crear tarea con estado válido
+        task = Task(id=1, name="Tarea", status=status)
+        assert task.status == status
+        
+        # Actualizar a estado válido
+        task.update(status=status)
+        assert task.status == status
+    
+    @pytest.fixture
+    def sample_task(self):
+        """Tarea fija usada para comprobar sus representaciones"""
+        return Task(id=1, name="Mi Tarea", status="pendiente", due_date=datetime(2024, 12, 25))
+    
+    @pytest.mark.parametrize("fmt, expected", [
+        (str, "Tarea #1: Mi Tarea [PENDIENTE] - Vence: 2024-12-25"),
+        (repr, "Task(id=1, name='Mi Tarea', status='pendiente', due_date=2024-12-25 00:00:00)"),
+    ], ids=["str", "repr"])
+    def test_task_representation(self, sample_task, fmt, expected):
+        """Verifica la representación en cadena y la representación técnica de la tarea"""
+        # Act
+        representation = fmt(sample_task)
+        
+        # Assert
+        assert representation == expected
     
-    def test_task_date_handling(self):
+    def test_task_date_handling(self, frozen_now):
         """Verifica el manejo correcto de fechas"""
         # Test con fecha específica
         specific_date = datetime(2024, 12, 25, 15, 30)
@@ -210,10 +278,8 @@ class TestTask:
         
         # Test con fecha None (debe usar fecha actual)
         task2 = Task(id=2, name="Tarea", due_date=None)
-        assert isinstance(task2.due_date, datetime)
-        # Verificar que la fecha es reciente (dentro de 1 minuto)
-        time_diff = abs((datetime.now() - task2.due_date).total_seconds())
-        assert time_diff < 60
+        assert task2.due_date == frozen_now
+        assert task2.created_at == frozen_now
 
 
 if __name__ == "__main__":
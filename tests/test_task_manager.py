@@ -6,28 +6,155 @@ de la clase TaskManager y sus métodos.
 """
 
 import pytest
+import time_machine
+import copy
 import os
-import tempfile
+import sys
+import json
 from datetime import datetime, timedelta
+from itertools import product
 from src.task_manager import TaskManager
 from src.task import Task
+from src.storage import MemoryStorage
+from tests.conftest import FROZEN_NOW
+
+
+# Tareas compartidas por las pruebas de solo lectura (filtros y búsquedas)
+SEED_TASKS = [
+    {"name": "Estudiar Python", "description": "Aprender conceptos básicos"},
+    {"name": "Proyecto de Python", "description": "Desarrollar aplicación en Python"},
+    {"name": "Tarea de JavaScript", "description": "Funciones avanzadas"},
+    {"name": "python avanzado"},
+]
+
+# Conjuntos de tareas para estadísticas y vencidas, con fechas relativas a FROZEN_NOW
+SEED_A = [
+    {"name": "Pendiente 1", "status": "pendiente", "due_date": FROZEN_NOW},
+    {"name": "Pendiente 2", "status": "pendiente", "due_date": FROZEN_NOW},
+    {"name": "En progreso 1", "status": "en_progreso", "due_date": FROZEN_NOW},
+    {"name": "Completada 1", "status": "completada", "due_date": FROZEN_NOW},
+    {"name": "Completada 2", "status": "completada", "due_date": FROZEN_NOW},
+    {"name": "Vencida", "status": "pendiente", "due_date": FROZEN_NOW - timedelta(days=1)},
+]
+SEED_B = [
+    {"name": "Vencida ayer", "status": "pendiente",
+     "due_date": FROZEN_NOW - timedelta(days=1)},
+    {"name": "Vencida semana pasada", "status": "en_progreso",
+     "due_date": FROZEN_NOW - timedelta(days=7)},
+    {"name": "Vencida pero completada", "status": "completada",
+     "due_date": FROZEN_NOW - timedelta(days=1)},
+    {"name": "No vencida", "status": "pendiente",
+     "due_date": FROZEN_NOW + timedelta(days=1)},
+]
+
+# Las pruebas de persistencia suponen que os.replace sustituye el archivo de forma atómica
+requires_atomic_replace = pytest.mark.skipif(
+    sys.platform == "win32",
+    reason="el reemplazo de archivos no es atómico en Windows"
+)
+
+# Tareas que test_save_and_load guarda y espera recuperar
+SAVED_TASKS = [
+    {"name": "Tarea 1", "description": "Descripción 1", "status": "pendiente"},
+    {"name": "Tarea 2", "description": "Descripción 2", "status": "completada"},
+]
+
+# Archivo de datos equivalente a SAVED_TASKS, serializado una sola vez
+_SAVED_STATE = json.dumps({
+    "tasks": [
+        {
+            "id": task_id,
+            "due_date": "2024-12-27T09:00:00",
+            "created_at": "2024-12-20T09:00:00",
+            **spec
+        }
+        for task_id, spec in enumerate(SAVED_TASKS, start=1)
+    ],
+    "next_id": len(SAVED_TASKS) + 1
+})
+
+# Ejes de test_filter_combined: estado × texto del nombre × días hasta due_date_to
+FILTER_AXES = (
+    ["pendiente", "en_progreso", "completada"],
+    ["Python", "progreso"],
+    [0, 1],
+)
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Parametriza filter_case con cada valor de cada eje al menos una vez, o con
+    la matriz completa si se ejecuta con --all-combinations.
+    """
+    if "filter_case" not in metafunc.fixturenames:
+        return
+    if metafunc.config.getoption("all_combinations"):
+        cases = list(product(*FILTER_AXES))
+    else:
+        width = max(len(axis) for axis in FILTER_AXES)
+        cases = [tuple(axis[i % len(axis)] for axis in FILTER_AXES) for i in range(width)]
+    metafunc.parametrize("filter_case", cases,
+                         ids=[f"{status}-{text}-{days}d" for status, text, days in cases])
+
+
+@pytest.fixture(autouse=True)
+def no_autosave(request, monkeypatch):
+    """Crea los gestores sin autosave salvo en las pruebas marcadas con persistence."""
+    if request.node.get_closest_marker("persistence") is None:
+        monkeypatch.setattr(TaskManager, "default_autosave", False)
+
+
+@pytest.fixture(scope="module")
+def manager_file(tmp_path_factory):
+    """Archivo de datos compartido por todas las pruebas del módulo."""
+    return str(tmp_path_factory.mktemp("tm") / "tasks.json")
+
+
+@pytest.fixture(scope="module")
+def seeded_manager():
+    """Gestor en memoria con SEED_TASKS, creado una vez por módulo; las pruebas no deben modificarlo."""
+    manager = TaskManager(storage=MemoryStorage())
+    with manager.batch():
+        for spec in SEED_TASKS:
+            manager.create_task(**spec)
+    return manager
+
+
+@pytest.fixture(scope="module")
+def seeded(request):
+    """
+    Gestor en memoria con las tareas de request.param (SEED_A o SEED_B).
+    
+    Se usa con parametrize(..., indirect=["seeded"], scope="module"): pytest
+    agrupa las pruebas por conjunto y crea cada gestor una sola vez; no debe
+    modificarse.
+    """
+    manager = TaskManager(storage=MemoryStorage())
+    with manager.batch():
+        for spec in request.param:
+            manager.create_task(**spec)
+    return manager
 
 
 class TestTaskManager:
     """Pruebas para la clase TaskManager."""
     
-    def setup_method(self):
-        """Configuración antes de cada prueba."""
-        # Crear archivo temporal para las pruebas
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-        self.temp_file.close()
-        self.task_manager = TaskManager(data_file=self.temp_file.name)
-    
-    def teardown_method(self):
-        """Limpieza después de cada prueba."""
-        # Eliminar archivo temporal
-        if os.path.exists(self.temp_file.name):
-            os.unlink(self.temp_file.name)
+    @pytest.fixture(autouse=True)
+    def setup_task_manager(self, manager_file, request):
+        """
+        Configuración antes de cada prueba: un gestor en memoria, o sobre el
+        archivo compartido si la prueba está marcada con ``persistence``.
+        """
+        self.data_file = manager_file
+        if request.node.get_closest_marker("persistence") is None:
+            self.task_manager = TaskManager(storage=MemoryStorage())
+            yield
+            return
+        self.task_manager = TaskManager(data_file=manager_file)
+        yield
+        # Dejar el archivo vacío y sin diario para la siguiente prueba
+        self.task_manager.clear_all_tasks()
+        self.task_manager.compact()
     
     def test_create_task(self):
         """✅ test_create_task: Verifica la creación de tareas"""
@@ -64,14 +191,12 @@ class TestTaskManager:
         assert task.status == "pendiente"
         assert isinstance(task.due_date, datetime)
     
-    def test_create_task_empty_name(self):
+    @pytest.mark.parametrize("name", ["", "   "], ids=["vacio", "solo_espacios"])
+    def test_create_task_empty_name(self, name):
         """Verifica que no se pueden crear tareas con nombre vacío"""
         # Act & Assert
         with pytest.raises(ValueError, match="El nombre de la tarea no puede estar vacío"):
-            self.task_manager.create_task(name="")
-        
-        with pytest.raises(ValueError, match="El nombre de la tarea no puede estar vacío"):
-            self.task_manager.create_task(name="   ")  # Solo espacios
+            self.task_manager.create_task(name=name)
     
     def test_create_multiple_tasks(self):
         """Verifica la creación de múltiples tareas con IDs secuenciales"""
@@ -181,26 +306,25 @@ class TestTaskManager:
         assert found_task2 == task2
         assert not_found is None
     
-    def test_filter_by_status(self):
+    @pytest.mark.parametrize("status, expected_names", [
+        ("pendiente", ["Tarea 1", "Tarea 4"]),
+        ("en_progreso", ["Tarea 2"]),
+        ("completada", ["Tarea 3"]),
+    ], ids=["pendiente", "en_progreso", "completada"])
+    def test_filter_by_status(self, status, expected_names):
         """✅ test_filter_by_status: Verifica el filtrado por estado"""
         # Arrange
-        task1 = self.task_manager.create_task(name="Tarea 1", status="pendiente")
-        task2 = self.task_manager.create_task(name="Tarea 2", status="en_progreso")
-        task3 = self.task_manager.create_task(name="Tarea 3", status="completada")
-        task4 = self.task_manager.create_task(name="Tarea 4", status="pendiente")
+        self.task_manager.create_task(name="Tarea 1", status="pendiente")
+        self.task_manager.create_task(name="Tarea 2", status="en_progreso")
+        self.task_manager.create_task(name="Tarea 3", status="completada")
+        self.task_manager.create_task(name="Tarea 4", status="pendiente")
         
         # Act
-        pendientes = self.task_manager.filter_tasks(status="pendiente")
-        en_progreso = self.task_manager.filter_tasks(status="en_progreso")
-        completadas = self.task_manager.filter_tasks(status="completada")
+        filtered = self.task_manager.filter_tasks(status=status)
         
         # Assert
-        assert len(pendientes) == 2
-        assert all(task.status == "pendiente" for task in pendientes)
-        assert len(en_progreso) == 1
-        assert en_progreso[0] == task2
-        assert len(completadas) == 1
-        assert completadas[0] == task3
+        assert [task.name for task in filtered] == expected_names
+        assert all(task.status == status for task in filtered)
     
     def test_filter_by_date(self):
         """✅ test_filter_by_date: Verifica el filtrado por fecha"""
@@ -226,174 +350,537 @@ class TestTaskManager:
         assert len(only_today) == 1  # solo today
         assert only_today[0] == task2
     
-    def test_filter_by_name_contains(self):
-        """Verifica el filtrado por texto en el nombre"""
+    def test_filter_by_date_keeps_creation_order(self):
+        """Verifica que el filtrado por fecha devuelve las tareas en orden de creación"""
         # Arrange
-        task1 = self.task_manager.create_task(name="Estudiar Python")
-        task2 = self.task_manager.create_task(name="Proyecto de Python")
-        task3 = self.task_manager.create_task(name="Tarea de JavaScript")
-        task4 = self.task_manager.create_task(name="python avanzado")
+        today = datetime.now()
+        late = self.task_manager.create_task(name="Tarea tarde", due_date=today + timedelta(days=5))
+        early = self.task_manager.create_task(name="Tarea pronto", due_date=today + timedelta(days=1))
+        self.task_manager.create_task(name="Tarea fuera", due_date=today + timedelta(days=30))
         
         # Act
-        python_tasks = self.task_manager.filter_tasks(name_contains="python")
-        js_tasks = self.task_manager.filter_tasks(name_contains="JavaScript")
-        proyecto_tasks = self.task_manager.filter_tasks(name_contains="Proyecto")
+        result = self.task_manager.filter_tasks(due_date_from=today,
+                                                due_date_to=today + timedelta(days=7))
+        
+        # Assert
+        assert result == [late, early]
+    
+    def test_filter_by_name_contains(self, seeded_manager):
+        """Verifica el filtrado por texto en el nombre"""
+        # Act
+        python_tasks = seeded_manager.filter_tasks(name_contains="python")
+        js_tasks = seeded_manager.filter_tasks(name_contains="JavaScript")
+        proyecto_tasks = seeded_manager.filter_tasks(name_contains="Proyecto")
         
         # Assert
         assert len(python_tasks) == 3  # Búsqueda insensible a mayúsculas
         assert len(js_tasks) == 1
         assert len(proyecto_tasks) == 1
     
-    def test_filter_combined(self):
+    def test_filter_combined(self, frozen_now, filter_case):
         """Verifica el filtrado con múltiples criterios"""
         # Arrange
-        today = datetime.now()
+        status, text, days = filter_case
+        today = frozen_now
         tomorrow = today + timedelta(days=1)
         
-        task1 = self.task_manager.create_task(
-            name="Python pendiente",
-            status="pendiente",
-            due_date=today
-        )
-        task2 = self.task_manager.create_task(
-            name="Python en progreso",
-            status="en_progreso",
-            due_date=today
-        )
-        task3 = self.task_manager.create_task(
-            name="Python pendiente mañana",
-            status="pendiente",
-            due_date=tomorrow
-        )
+        tasks = [
+            self.task_manager.create_task(
+                name="Python pendiente",
+                status="pendiente",
+                due_date=today
+            ),
+            self.task_manager.create_task(
+                name="Python en progreso",
+                status="en_progreso",
+                due_date=today
+            ),
+            self.task_manager.create_task(
+                name="Python pendiente mañana",
+                status="pendiente",
+                due_date=tomorrow
+            ),
+            self.task_manager.create_task(
+                name="Java completada",
+                status="completada",
+                due_date=tomorrow
+            ),
+        ]
+        due_date_to = today + timedelta(days=days)
+        expected = [
+            task for task in tasks
+            if task.status == status
+            and text.lower() in task.name.lower()
+            and task.due_date <= due_date_to
+        ]
         
         # Act
         filtered = self.task_manager.filter_tasks(
-            status="pendiente",
-            name_contains="Python",
-            due_date_to=today
+            status=status,
+            name_contains=text,
+            due_date_to=due_date_to
         )
         
         # Assert
-        assert len(filtered) == 1
-        assert filtered[0] == task1
+        assert filtered == expected
     
-    def test_get_tasks_by_status(self):
+    @pytest.mark.parametrize("status, expected_count", [
+        ("pendiente", 2),
+        ("completada", 1),
+        ("en_progreso", 0),
+    ], ids=["pendiente", "completada", "en_progreso_vacio"])
+    def test_get_tasks_by_status(self, status, expected_count):
         """Verifica el método get_tasks_by_status"""
         # Arrange
-        task1 = self.task_manager.create_task(name="Tarea 1", status="pendiente")
-        task2 = self.task_manager.create_task(name="Tarea 2", status="pendiente")
-        task3 = self.task_manager.create_task(name="Tarea 3", status="completada")
+        self.task_manager.create_task(name="Tarea 1", status="pendiente")
+        self.task_manager.create_task(name="Tarea 2", status="pendiente")
+        self.task_manager.create_task(name="Tarea 3", status="completada")
         
         # Act
-        pendientes = self.task_manager.get_tasks_by_status("pendiente")
-        completadas = self.task_manager.get_tasks_by_status("completada")
-        en_progreso = self.task_manager.get_tasks_by_status("en_progreso")
+        tasks = self.task_manager.get_tasks_by_status(status)
         
         # Assert
-        assert len(pendientes) == 2
-        assert len(completadas) == 1
-        assert len(en_progreso) == 0
+        assert len(tasks) == expected_count
+        assert all(task.status == status for task in tasks)
     
-    def test_get_overdue_tasks(self):
+    @pytest.mark.parametrize("seeded, expected_names", [
+        (SEED_A, ["Vencida"]),
+        (SEED_B, ["Vencida ayer", "Vencida semana pasada"]),  # La completada no cuenta
+    ], indirect=["seeded"], scope="module", ids=["seed_a", "seed_b"])
+    def test_get_overdue_tasks(self, frozen_now, seeded, expected_names):
         """Verifica la obtención de tareas vencidas"""
+        # Act
+        overdue_tasks = seeded.get_overdue_tasks()
+        
+        # Assert
+        assert [task.name for task in overdue_tasks] == expected_names
+    
+    def test_get_overdue_tasks_after_update(self):
+        """Verifica que las vencidas reflejan cambios de fecha y estado"""
         # Arrange
         yesterday = datetime.now() - timedelta(days=1)
         tomorrow = datetime.now() + timedelta(days=1)
-        last_week = datetime.now() - timedelta(days=7)
-        
-        task1 = self.task_manager.create_task(name="Vencida ayer", due_date=yesterday, status="pendiente")
-        task2 = self.task_manager.create_task(name="Vencida semana pasada", due_date=last_week, status="en_progreso")
-        task3 = self.task_manager.create_task(name="Vencida pero completada", due_date=yesterday, status="completada")
-        task4 = self.task_manager.create_task(name="No vencida", due_date=tomorrow, status="pendiente")
+        task1 = self.task_manager.create_task(name="Vencida", due_date=yesterday)
+        task2 = self.task_manager.create_task(name="Se completa", due_date=yesterday)
+        task3 = self.task_manager.create_task(name="Se aplaza", due_date=yesterday)
         
         # Act
+        self.task_manager.update_task(task_id=task2.id, status="completada")
+        self.task_manager.update_task(task_id=task3.id, due_date=tomorrow)
         overdue_tasks = self.task_manager.get_overdue_tasks()
         
         # Assert
-        assert len(overdue_tasks) == 2  # task1 y task2 (task3 está completada)
-        overdue_ids = [task.id for task in overdue_tasks]
-        assert task1.id in overdue_ids
-        assert task2.id in overdue_ids
-        assert task3.id not in overdue_ids
-        assert task4.id not in overdue_ids
+        assert overdue_tasks == [task1]
+        assert self.task_manager.get_task_statistics()["vencidas"] == 1
     
-    def test_get_task_statistics(self):
+    @pytest.mark.parametrize("seeded, expected", [
+        (SEED_A, {"total": 6, "pendiente": 3, "en_progreso": 1, "completada": 2, "vencidas": 1}),
+        (SEED_B, {"total": 4, "pendiente": 2, "en_progreso": 1, "completada": 1, "vencidas": 2}),
+    ], indirect=["seeded"], scope="module", ids=["seed_a", "seed_b"])
+    def test_get_task_statistics(self, frozen_now, seeded, expected):
         """Verifica las estadísticas de tareas"""
-        # Arrange
-        yesterday = datetime.now() - timedelta(days=1)
-        tomorrow = datetime.now() + timedelta(days=1)
+        # Act
+        stats = seeded.get_task_statistics()
         
-        self.task_manager.create_task(name="Pendiente 1", status="pendiente")
-        self.task_manager.create_task(name="Pendiente 2", status="pendiente")
-        self.task_manager.create_task(name="En progreso 1", status="en_progreso")
-        self.task_manager.create_task(name="Completada 1", status="completada")
-        self.task_manager.create_task(name="Completada 2", status="completada")
-        self.task_manager.create_task(name="Vencida", due_date=yesterday, status="pendiente")
+        # Assert - Con el reloj congelado, un due_date igual a "ahora" no cuenta como vencido
+        for key, value in expected.items():
+            assert stats[key] == value
+    
+    def test_get_task_statistics_cache_invalidation(self):
+        """Verifica que las estadísticas cacheadas se recalculan al cambiar tareas o pasar un vencimiento"""
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            # Arrange
+            task = self.task_manager.create_task(name="Tarea", due_date=FROZEN_NOW + timedelta(hours=1))
+            first = self.task_manager.get_task_statistics()
+            first["total"] = 99  # Modificar la copia devuelta no altera la caché
+            
+            # Act
+            self.task_manager.update_task(task.id, status="en_progreso")
+            after_update = self.task_manager.get_task_statistics()
+            traveller.move_to(FROZEN_NOW + timedelta(hours=2))
+            after_due = self.task_manager.get_task_statistics()
         
-        # Act
-        stats = self.task_manager.get_task_statistics()
+        # Assert
+        assert after_update["total"] == 1
+        assert after_update["en_progreso"] == 1
+        assert after_update["vencidas"] == 0
+        assert after_due["vencidas"] == 1
+    
+    def test_get_task_statistics_clock_moves_back(self):
+        """Verifica que las estadísticas cacheadas se recalculan si el reloj retrocede"""
+        with time_machine.travel(FROZEN_NOW, tick=False) as traveller:
+            # Arrange
+            self.task_manager.create_task(name="Tarea", due_date=FROZEN_NOW - timedelta(hours=1))
+            before = self.task_manager.get_task_statistics()
+            
+            # Act
+            traveller.move_to(FROZEN_NOW - timedelta(hours=2))
+            after = self.task_manager.get_task_statistics()
+            overdue = self.task_manager.get_overdue_tasks()
         
         # Assert
-        assert stats["total"] == 6
-        assert stats["pendiente"] == 3  # Incluye la vencida
-        assert stats["en_progreso"] == 1
-        assert stats["completada"] == 2
-        # Solo la tarea con due_date de ayer y estado pendiente debería contar como vencida
-        # Las otras tareas tienen due_date de "ahora" por defecto, así que también pueden estar vencidas
-        assert stats["vencidas"] >= 1  # Al menos 1 vencida (la que creamos explícitamente)
+        assert before["vencidas"] == 1
+        assert after["vencidas"] == 0
+        assert after["vencidas"] == len(overdue)
     
-    def test_save_and_load(self):
+    @pytest.mark.persistence
+    @requires_atomic_replace
+    @pytest.mark.parametrize("mode", ["roundtrip", "preloaded"], ids=["ida_y_vuelta", "precargado"])
+    def test_save_and_load(self, mode):
         """✅ test_save_and_load: Verifica la persistencia de datos"""
-        # Arrange - Crear tareas
-        original_task1 = self.task_manager.create_task(
-            name="Tarea 1",
-            description="Descripción 1",
-            status="pendiente"
-        )
-        original_task2 = self.task_manager.create_task(
-            name="Tarea 2",
-            description="Descripción 2",
-            status="completada"
-        )
+        # Arrange - Guardar las tareas desde el gestor o escribir el archivo ya serializado
+        if mode == "roundtrip":
+            for spec in SAVED_TASKS:
+                self.task_manager.create_task(**spec)
+        else:
+            with open(self.data_file, 'w', encoding='utf-8') as f:
+                f.write(_SAVED_STATE)
         
         # Act - Crear nuevo TaskManager con el mismo archivo
-        new_task_manager = TaskManager(data_file=self.temp_file.name)
+        new_task_manager = TaskManager(data_file=self.data_file)
+        
+        # Assert - Verificar que los datos se cargaron correctamente
+        loaded = [
+            {"name": t.name, "description": t.description, "status": t.status}
+            for t in new_task_manager.list_tasks()
+        ]
+        assert loaded == SAVED_TASKS
+        assert new_task_manager.next_id == len(SAVED_TASKS) + 1
+    
+    @pytest.mark.persistence
+    def test_changes_are_journaled_and_replayed(self):
+        """Verifica que los cambios se añaden al diario y se reaplican al cargar"""
+        # Arrange - Un archivo de datos suficientemente grande para no compactar
+        task1 = self.task_manager.create_task(name="Tarea 1")
+        for i in range(5):
+            self.task_manager.create_task(name=f"Relleno {i}")
+        self.task_manager.save_to_file()
+        snapshot_size = os.path.getsize(self.data_file)
+        
+        # Act
+        task2 = self.task_manager.create_task(name="Tarea 2")
+        self.task_manager.update_task(task1.id, status="completada")
+        self.task_manager.delete_task(task2.id)
+        reloaded = TaskManager(data_file=self.data_file)
+        
+        # Assert
+        assert os.path.getsize(self.data_file) == snapshot_size
+        assert os.path.exists(self.data_file + ".log")
+        assert task2.id not in [t.id for t in reloaded.list_tasks()]
+        assert len(reloaded) == 6
+        assert reloaded.get_task_by_id(task1.id).status == "completada"
+        assert reloaded.next_id == 8
+    
+    @pytest.mark.persistence
+    def test_journal_truncated_line_is_ignored(self):
+        """Verifica que una línea incompleta al final del diario se ignora y no oculta cambios posteriores"""
+        # Arrange - Un archivo de datos suficientemente grande para no compactar
+        self.task_manager.create_task(name="Tarea 1")
+        for i in range(5):
+            self.task_manager.create_task(name=f"Relleno {i}")
+        self.task_manager.save_to_file()
+        self.task_manager.create_task(name="Tarea 2")
+        with open(self.data_file + ".log", 'ab') as f:
+            f.write(b'{"op": "upsert", "task": {"id": 8, "na')
+        
+        # Act
+        reloaded = TaskManager(data_file=self.data_file)
+        loaded_count = len(reloaded.list_tasks())
+        new_task = reloaded.create_task(name="Tarea 3")
+        reloaded.update_task(1, status="completada")
+        reloaded_again = TaskManager(data_file=self.data_file)
         
         # Assert
-        loaded_tasks = new_task_manager.list_tasks()
-        assert len(loaded_tasks) == 2
+        assert loaded_count == 7
+        assert len(reloaded_again.list_tasks()) == 8
+        assert reloaded_again.get_task_by_id(new_task.id).name == "Tarea 3"
+        assert reloaded_again.get_task_by_id(1).status == "completada"
+        assert reloaded_again.next_id == new_task.id + 1
+    
+    @pytest.mark.persistence
+    def test_compact_folds_journal_into_file(self):
+        """Verifica que compact() integra el diario en el archivo de datos"""
+        # Arrange
+        self.task_manager.create_task(name="Tarea 1")
+        self.task_manager.create_task(name="Tarea 2")
+        assert os.path.exists(self.data_file + ".log")
         
-        # Verificar que los datos se cargaron correctamente
-        loaded_task1 = new_task_manager.get_task_by_id(original_task1.id)
-        loaded_task2 = new_task_manager.get_task_by_id(original_task2.id)
+        # Act
+        compacted = self.task_manager.compact()
         
-        assert loaded_task1.name == original_task1.name
-        assert loaded_task1.description == original_task1.description
-        assert loaded_task1.status == original_task1.status
+        # Assert
+        assert compacted is True
+        assert not os.path.exists(self.data_file + ".log")
+        assert len(TaskManager(data_file=self.data_file)) == 2
+    
+    @pytest.mark.persistence
+    def test_save_to_file_compacts_journal(self):
+        """Verifica que guardar el archivo completo descarta el diario"""
+        # Arrange
+        self.task_manager.create_task(name="Tarea 1")
+        self.task_manager.create_task(name="Tarea 2")
         
-        assert loaded_task2.name == original_task2.name
-        assert loaded_task2.description == original_task2.description
-        assert loaded_task2.status == original_task2.status
+        # Act
+        self.task_manager.save_to_file()
+        
+        # Assert
+        assert not os.path.exists(self.data_file + ".log")
+        assert len(TaskManager(data_file=self.data_file)) == 2
     
-    def test_search_tasks(self):
-        """Verifica la búsqueda de tareas"""
+    @pytest.mark.persistence
+    def test_save_to_file_pretty(self, tmp_path):
+        """Verifica que el archivo de datos es compacto y la exportación indentada"""
         # Arrange
-        task1 = self.task_manager.create_task(name="Estudiar Python", description="Aprender conceptos básicos")
-        task2 = self.task_manager.create_task(name="Proyecto final", description="Desarrollar aplicación en Python")
-        task3 = self.task_manager.create_task(name="Tarea de JavaScript", description="Funciones avanzadas")
+        self.task_manager.create_task(name="Tarea 1")
+        export_file = tmp_path / "export.json"
         
         # Act
-        python_search = self.task_manager.search_tasks("Python")
-        concepto_search = self.task_manager.search_tasks("conceptos")
-        javascript_search = self.task_manager.search_tasks("JavaScript")
-        not_found_search = self.task_manager.search_tasks("C++")  # Buscar algo que no existe
+        self.task_manager.save_to_file()
+        self.task_manager.save_to_file(str(export_file), pretty=True)
         
         # Assert
-        assert len(python_search) == 2
+        with open(self.data_file, encoding='utf-8') as f:
+            assert "\n" not in f.read()
+        assert '\n  "tasks"' in export_file.read_text(encoding='utf-8')
+    
+    @pytest.mark.persistence
+    def test_export_keeps_journal_of_target_file(self, tmp_path):
+        """Verifica que exportar a otro archivo no borra el diario de ese archivo"""
+        # Arrange
+        self.task_manager.create_task(name="Tarea 1")
+        export_file = tmp_path / "backup.json"
+        journal_file = tmp_path / "backup.json.log"
+        journal_file.write_text("{}\n", encoding='utf-8')
+        
+        # Act
+        saved = self.task_manager.save_to_file(str(export_file))
+        
+        # Assert
+        assert saved is True
+        assert journal_file.read_text(encoding='utf-8') == "{}\n"
+    
+    @pytest.mark.persistence
+    @requires_atomic_replace
+    def test_failed_save_keeps_previous_file(self, monkeypatch):
+        """Verifica que un fallo al guardar no corrompe el archivo existente"""
+        # Arrange
+        self.task_manager.create_task(name="Tarea 1")
+        self.task_manager.save_to_file()
+        with open(self.data_file, 'rb') as f:
+            before = f.read()
+        
+        def failing_fsync(fd):
+            raise OSError("disco lleno")
+        monkeypatch.setattr(os, "fsync", failing_fsync)
+        
+        # Act
+        self.task_manager.create_task(name="Tarea 2")
+        saved = self.task_manager.save_to_file()
+        
+        # Assert
+        assert saved is False
+        with open(self.data_file, 'rb') as f:
+            assert f.read() == before
+        assert not os.path.exists(self.data_file + ".tmp")
+    
+    @pytest.mark.persistence
+    @pytest.mark.parametrize("filename, module", [
+        ("tasks.json", None),
+        ("tasks.msgpack", "msgpack"),
+    ], ids=["json", "msgpack"])
+    def test_save_and_load_formats(self, tmp_path, filename, module):
+        """Verifica la persistencia en cada formato de archivo admitido"""
+        # Arrange
+        if module is not None:
+            pytest.importorskip(module)
+        data_file = str(tmp_path / filename)
+        task = self.task_manager.create_task(name="Tarea binaria", description="Ñandú")
+        
+        # Act
+        saved = self.task_manager.save_to_file(data_file)
+        loaded = TaskManager(data_file=data_file)
+        
+        # Assert
+        assert saved is True
+        loaded_task = loaded.get_task_by_id(task.id)
+        assert loaded_task.description == "Ñandú"
+        assert loaded_task.due_date == task.due_date
+        assert loaded.next_id == self.task_manager.next_id
+    
+    @pytest.mark.persistence
+    def test_autosave_disabled_and_flush(self):
+        """Verifica que sin autosave los cambios se escriben al hacer flush"""
+        # Arrange
+        manager = TaskManager(data_file=self.data_file, autosave=False)
+        
+        # Act
+        manager.create_task(name="Tarea 1")
+        manager.create_task(name="Tarea 2")
+        before_flush = TaskManager(data_file=self.data_file)
+        manager.flush()
+        after_flush = TaskManager(data_file=self.data_file)
+        
+        # Assert
+        assert len(before_flush.list_tasks()) == 0
+        assert len(after_flush.list_tasks()) == 2
+    
+    @pytest.mark.persistence
+    def test_batch_saves_once_on_exit(self):
+        """Verifica que batch() aplaza el guardado hasta el final del bloque"""
+        # Act
+        with self.task_manager.batch():
+            self.task_manager.create_task(name="Tarea 1")
+            self.task_manager.create_task(name="Tarea 2")
+            inside = TaskManager(data_file=self.data_file)
+        after = TaskManager(data_file=self.data_file)
+        
+        # Assert
+        assert len(inside) == 0
+        assert len(after) == 2
+        assert self.task_manager.autosave is True
+    
+    @pytest.mark.persistence
+    def test_context_manager_flushes_on_exit(self):
+        """Verifica que el bloque with guarda los cambios pendientes"""
+        # Act
+        with TaskManager(data_file=self.data_file, autosave=False) as manager:
+            manager.create_task(name="Tarea en bloque")
+        
+        # Assert
+        reloaded = TaskManager(data_file=self.data_file)
+        assert [t.name for t in reloaded.list_tasks()] == ["Tarea en bloque"]
+    
+    def test_task_changes_outside_update_task_keep_indexes(self, frozen_now):
+        """Verifica que cambiar una tarea directamente actualiza índices, búsquedas y estadísticas"""
+        # Arrange
+        yesterday = frozen_now - timedelta(days=1)
+        task = self.task_manager.create_task(name="Estudiar Python",
+                                             due_date=frozen_now + timedelta(days=1))
+        other = self.task_manager.create_task(name="Otra tarea")
+        removed = self.task_manager.create_task(name="Eliminada")
+        self.task_manager.search_tasks("python")  # Llenar la caché de búsqueda
+        self.task_manager.delete_task(removed.id)
+        
+        # Act
+        self.task_manager.get_task_by_id(task.id).update(name="Leer libro", status="completada")
+        task.due_date = yesterday
+        other.due_date = yesterday
+        removed.update(status="completada")  # Ya no pertenece al gestor
+        
+        # Assert
+        assert self.task_manager.get_tasks_by_status("completada") == [task]
+        assert self.task_manager.search_tasks("python") == []
+        assert self.task_manager.search_tasks("libro") == [task]
+        assert self.task_manager.get_overdue_tasks() == [other]
+        assert self.task_manager.filter_tasks(due_date_to=yesterday) == [task, other]
+        stats = self.task_manager.get_task_statistics()
+        assert stats["completada"] == 1
+        assert stats["vencidas"] == 1
+    
+    @pytest.mark.parametrize("attr, value", [
+        ("status", "bogus"),
+        ("due_date", None),
+    ], ids=["estado_invalido", "fecha_none"])
+    def test_invalid_direct_change_keeps_manager_consistent(self, frozen_now, attr, value):
+        """Verifica que un cambio directo inválido falla sin desincronizar el gestor"""
+        # Arrange
+        yesterday = frozen_now - timedelta(days=1)
+        task = self.task_manager.create_task(name="Tarea vencida", due_date=yesterday)
+        
+        # Act
+        with pytest.raises(ValueError):
+            setattr(task, attr, value)
+        later = self.task_manager.create_task(name="Tarea posterior", due_date=yesterday)
+        
+        # Assert
+        assert task.status == "pendiente"
+        assert task.due_date == yesterday
+        assert self.task_manager.get_tasks_by_status("pendiente") == [task, later]
+        assert self.task_manager.get_overdue_tasks() == [task, later]
+        assert self.task_manager.search_tasks("vencida") == [task]
+        assert self.task_manager.delete_task(task.id) is True
+        assert self.task_manager.get_overdue_tasks() == [later]
+    
+    def test_copied_task_is_not_linked_to_manager(self):
+        """Verifica que una copia de una tarea del gestor no lo modifica ni lo copia"""
+        # Arrange
+        task = self.task_manager.create_task(name="Original")
+        
+        # Act
+        copied = copy.deepcopy(task)
+        copied.update(name="Copia", status="completada")
+        
+        # Assert
+        assert copied._owner is None
+        assert self.task_manager.get_task_by_id(task.id).name == "Original"
+        assert self.task_manager.get_tasks_by_status("completada") == []
+        assert self.task_manager.search_tasks("copia") == []
+    
+    @pytest.mark.persistence
+    def test_task_changes_outside_update_task_are_saved(self):
+        """Verifica que los cambios hechos directamente sobre una tarea se guardan"""
+        # Arrange
+        task = self.task_manager.create_task(name="Tarea 1")
+        
+        # Act
+        task.update(status="completada")
+        task.description = "Cambiada directamente"
+        reloaded = TaskManager(data_file=self.data_file)
+        
+        # Assert
+        loaded_task = reloaded.get_task_by_id(task.id)
+        assert loaded_task.status == "completada"
+        assert loaded_task.description == "Cambiada directamente"
+    
+    def test_search_tasks(self, seeded_manager):
+        """Verifica la búsqueda de tareas"""
+        # Act
+        python_search = seeded_manager.search_tasks("Python")
+        concepto_search = seeded_manager.search_tasks("conceptos")
+        javascript_search = seeded_manager.search_tasks("JavaScript")
+        not_found_search = seeded_manager.search_tasks("C++")  # Buscar algo que no existe
+        
+        # Assert
+        assert len(python_search) == 3  # En el nombre o en la descripción
         assert len(concepto_search) == 1
         assert len(javascript_search) == 1
         assert len(not_found_search) == 0
     
+    def test_search_tasks_after_changes(self):
+        """Verifica que la búsqueda refleja actualizaciones y eliminaciones"""
+        # Arrange
+        task1 = self.task_manager.create_task(name="Estudiar Python", description="Repasar listas")
+        task2 = self.task_manager.create_task(name="Leer libro", description="Novela")
+        
+        # Act
+        self.task_manager.update_task(task_id=task1.id, name="Estudiar Rust")
+        self.task_manager.update_task(task_id=task2.id, description="Libro de Python")
+        python_search = self.task_manager.search_tasks("python")
+        rust_search = self.task_manager.search_tasks("RUST")
+        self.task_manager.delete_task(task2.id)
+        after_delete = self.task_manager.search_tasks("python")
+        
+        # Assert
+        assert python_search == [task2]
+        assert rust_search == [task1]
+        assert after_delete == []
+    
+    def test_search_tasks_cached_results(self):
+        """Verifica que las búsquedas repetidas no comparten la lista devuelta"""
+        # Arrange
+        task = self.task_manager.create_task(name="Estudiar Python")
+        first = self.task_manager.search_tasks("python")
+        
+        # Act
+        first.clear()
+        second = self.task_manager.search_tasks("Python")
+        new_task = self.task_manager.create_task(name="Practicar Python")
+        third = self.task_manager.search_tasks("python")
+        
+        # Assert
+        assert second == [task]
+        assert third == [task, new_task]
+    
     def test_clear_all_tasks(self):
         """Verifica la eliminación de todas las tareas"""
         # Arrange
@@ -442,11 +929,3 @@ class TestTaskManager:
 
 if __name__ == "__main__":
     pytest.main([__file__])
-
-import pytest
-import os
-import tempfile
-from src.task_manager import TaskManager
-from src.task import Task
-
-
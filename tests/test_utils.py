@@ -0,0 +1,60 @@
+"""
+Pruebas unitarias para las funciones auxiliares de utils.
+
+Este módulo contiene las pruebas para verificar que parse_date conserva
+el comportamiento de la implementación original basada en strptime.
+"""
+
+import pytest
+from datetime import datetime
+from src.utils import parse_date
+
+
+def _strptime_parse_date(date_str):
+    """Implementación original de parse_date, usada como referencia"""
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d %H:%M")
+        except ValueError:
+            return None
+
+
+# Cadena de entrada y resultado esperado
+PARSE_DATE_CASES = [
+    ("2024-12-20", datetime(2024, 12, 20)),
+    ("2024-1-5", datetime(2024, 1, 5)),
+    ("2024-12-20 09:05", datetime(2024, 12, 20, 9, 5)),
+    ("2024-12-20 9:5", datetime(2024, 12, 20, 9, 5)),
+    ("2024-12-20   09:05", datetime(2024, 12, 20, 9, 5)),
+    ("2024-12-20\t09:05", datetime(2024, 12, 20, 9, 5)),
+    ("2024-02-29", datetime(2024, 2, 29)),
+    ("2024-02-30", None),
+    ("2023-02-29", None),
+    ("2024-13-01", None),
+    ("2024-12-20 25:00", None),
+    ("2024-12-20 23:60", None),
+    ("2024-12-20x", None),
+    ("2024-12-20 09:05x", None),
+    ("2024-12-20 09:05:00", None),
+    ("2024-12-20 ", None),
+    (" 2024-12-20", None),
+    ("24-12-20", None),
+    ("", None),
+]
+
+
+class TestUtils:
+    """Clase de pruebas para las funciones auxiliares"""
+    
+    @pytest.mark.parametrize("date_str, expected", PARSE_DATE_CASES,
+                             ids=[repr(case[0]) for case in PARSE_DATE_CASES])
+    def test_parse_date_matches_strptime(self, date_str, expected):
+        """Verifica que parse_date devuelve lo mismo que la versión con strptime"""
+        # Act
+        result = parse_date(date_str)
+        
+        # Assert
+        assert result == expected
+        assert result == _strptime_parse_date(date_str)